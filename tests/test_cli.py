@@ -18,3 +18,49 @@ def test_cli_no_args_runs_legacy_main(monkeypatch):
 
     assert result.exit_code == 0
     assert called["ok"] is True
+
+
+def test_main_forwards_overrides_and_verbose(monkeypatch):
+    seen = {}
+
+    class FakePipeline:
+        def __init__(self, overrides=None, verbose=False):
+            seen.update(overrides=overrides, verbose=verbose)
+
+        def run(self) -> None:
+            seen["ran"] = True
+
+    monkeypatch.setattr(vat_main, "VATAuditPipeline", FakePipeline)
+    vat_main.main(overrides={"parallel": {"enabled": False}}, verbose=True)
+    assert seen == {"overrides": {"parallel": {"enabled": False}}, "verbose": True, "ran": True}
+
+
+def test_pipeline_applies_gui_parallel_overrides_and_verbose(tmp_path, monkeypatch):
+    import logging
+
+    import config_manager
+
+    # 使用独立的配置实例，避免覆盖项残留到其他测试
+    monkeypatch.setattr(config_manager, "_config_instance", None)
+    paths = {}
+    for key in ("input_dir", "output_dir", "database_dir"):
+        paths[key] = str(tmp_path / key)
+        (tmp_path / key).mkdir()
+
+    logger = logging.getLogger("vat_audit")
+    saved_level, saved_handlers = logger.level, list(logger.handlers)
+    try:
+        pipeline = vat_main.VATAuditPipeline(
+            overrides={"paths": paths, "parallel": {"enabled": False, "worker_count": 3}},
+            verbose=True,
+        )
+        assert pipeline.runtime.enable_parallel_import is False
+        assert pipeline.runtime.worker_count == 3
+        assert pipeline.runtime.debug_mode is True
+        assert logger.level == logging.DEBUG
+    finally:
+        for handler in logger.handlers:
+            if handler not in saved_handlers:
+                handler.close()
+        logger.handlers[:] = saved_handlers
+        logger.setLevel(saved_level)
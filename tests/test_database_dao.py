@@ -117,6 +117,18 @@ class TestDatabaseConnection:
             assert db._conn is not None
         assert db._conn is None
 
+    def test_cursor_reused_across_queries(self, populated_db):
+        """测试同一连接复用游标，关闭后重置。"""
+        populated_db.execute_select("SELECT COUNT(*) FROM ODS_TEST_DETAIL")
+        cursor = populated_db._default_cursor
+        populated_db.execute_insert(
+            "INSERT INTO ODS_TEST_DETAIL (发票代码, 发票号码) VALUES (?, ?)",
+            ('CUR001', '000001')
+        )
+        assert populated_db._default_cursor is cursor
+        populated_db.close()
+        assert populated_db._default_cursor is None
+
     def test_pragma_optimize(self, db_connection):
         """测试 PRAGMA 优化。"""
         db_connection.pragma_optimize(mode='wal')
@@ -233,6 +245,24 @@ class TestDatabaseConnection:
         assert len(dict_list) > 0
         assert '发票代码' in dict_list[0]
 
+    def test_query_result_to_frame(self, populated_db):
+        """测试 QueryResult 转换为 DataFrame。"""
+        result = populated_db.execute_select(
+            "SELECT 发票代码, 金额 FROM ODS_TEST_DETAIL ORDER BY 发票代码"
+        )
+        df = result.to_frame()
+        assert list(df.columns) == ['发票代码', '金额']
+        assert len(df) == 4
+        assert df['金额'].iloc[0] == 100.0
+
+    def test_read_frame(self, populated_db):
+        """测试直接读取为 DataFrame。"""
+        df = populated_db.read_frame(
+            "SELECT * FROM ODS_TEST_DETAIL WHERE 开票年份=?", ('2023',)
+        )
+        assert len(df) == 3
+        assert populated_db.read_frame("SELECT * FROM NONEXISTENT_TABLE").empty
+
     def test_query_result_to_first_dict(self, populated_db):
         """测试 QueryResult 获取第一行字典。"""
         result = populated_db.execute_select(
@@ -264,6 +294,80 @@ class TestDAOBase:
         records = dao.find_all()
         assert len(records) == 4
 
+    def test_truncate_and_drop_table(self, populated_db):
+        """测试 truncate/drop_table 走 DDL 通道并生效。"""
+        dao = DAOBase(populated_db, "ODS_TEST_DETAIL")
+        assert dao.truncate().is_success()
+        assert dao.count() == 0
+        assert dao.drop_table().is_success()
+        assert dao.table_exists() is False
+
+    def test_execute_ddl_commits_without_autocommit(self, temp_db):
+        """测试非自动提交模式下 DDL 也会提交。"""
+        with DatabaseConnection(temp_db, isolation_level="DEFERRED") as db:
+            db.execute_ddl("CREATE TABLE ddl_test (id INTEGER)")
+            dao = DAOBase(db, "ddl_test")
+            assert dao.create_index("IDX_DDL_TEST_ID", ["id"]).is_success()
+        with DatabaseConnection(temp_db) as db:
+            result = db.execute_select("SELECT name FROM sqlite_master WHERE name=?", ("IDX_DDL_TEST_ID",))
+            assert result.rowcount == 1
+
+    def test_bulk_insert_in_bulk_load_mode(self, populated_db):
+        """测试批量装载模式下 executemany 插入并恢复 PRAGMA。"""
+        populated_db.pragma_optimize(mode='wal')
+        dao = DAOBase(populated_db, "ODS_TEST_HEADER")
+        rows = [(f"BULK{i:03d}", f"{i:06d}", float(i), "2025") for i in range(50)]
+        with populated_db.bulk_load_mode(), populated_db.transaction():
+            result = dao.insert(["发票代码", "发票号码", "金额", "开票年份"], rows)
+        assert result.is_success()
+        assert result.rowcount == 50
+        assert dao.count() == 50
+        journal = populated_db.execute_pragma("PRAGMA journal_mode")
+        assert journal.rows[0][0].lower() == "wal"
+
+    def test_insert_skips_row_violating_constraint(self, populated_db):
+        """测试批量插入中间一行违反主键约束时，只跳过该行，其余行写入且不重复。"""
+        dao = DAOBase(populated_db, "ODS_TEST_DETAIL")
+        rows = [
+            ("2025001", "000001", 10.0, "2025"),
+            ("2023001", "000001", 20.0, "2023"),  # 与已有记录主键重复
+            ("2025002", "000002", 30.0, "2025"),
+        ]
+        result = dao.insert(["发票代码", "发票号码", "金额", "开票年份"], rows)
+        assert not result.is_success()
+        assert "UNIQUE" in result.error
+        assert result.rowcount == 2
+        assert dao.count() == 6
+        amounts = [tuple(r) for r in populated_db.execute_select(
+            "SELECT 发票代码, 金额 FROM ODS_TEST_DETAIL WHERE 发票代码 IN (?, ?, ?) ORDER BY 发票代码",
+            ("2023001", "2025001", "2025002"),
+        ).rows]
+        assert amounts == [("2023001", 100.0), ("2025001", 10.0), ("2025002", 30.0)]
+
+        # 在外层事务中同样逐行跳过，提交后生效
+        more = [("2025001", "000001", 1.0, "2025"), ("2025003", "000003", 1.0, "2025")]
+        with populated_db.transaction():
+            result = dao.insert(["发票代码", "发票号码", "金额", "开票年份"], more)
+        assert result.rowcount == 1
+        assert dao.count() == 7
+
+    def test_count_estimate(self, populated_db):
+        """测试统计信息行数估计，无统计信息时回退精确计数。"""
+        dao = DAOBase(populated_db, "ODS_TEST_DETAIL")
+        assert dao.count_estimate() == 4
+        with populated_db.bulk_load_mode():
+            pass
+        stat = populated_db.execute_select("SELECT stat FROM sqlite_stat1 WHERE tbl=?", ("ODS_TEST_DETAIL",))
+        assert stat.rowcount > 0
+        assert dao.count_estimate() == 4
+
+    def test_find_all_frame(self, populated_db):
+        """测试查询所有行为 DataFrame。"""
+        dao = DAOBase(populated_db, "ODS_TEST_DETAIL")
+        df = dao.find_all_frame(order_by="发票代码", limit=2)
+        assert len(df) == 2
+        assert df['发票代码'].tolist() == ['2023001', '2023002']
+
     def test_table_exists(self, populated_db):
         """测试表存在性检查。"""
         dao = DAOBase(populated_db, "ODS_TEST_DETAIL")
@@ -284,6 +388,16 @@ class TestODSDetailDAO:
         assert record['发票代码'] == '2023001'
         assert record['金额'] == 100.0
 
+    def test_find_by_invoices(self, populated_db):
+        """测试批量按发票号查找。"""
+        dao = ODSDetailDAO(populated_db, "TEST")
+        pairs = [('2023001', '000001'), ('2024001', '000001'), ('9999999', '000000'), ('2023001', '000001')]
+        records = dao.find_by_invoices(pairs)
+        assert set(records) == {('2023001', '000001'), ('2024001', '000001')}
+        assert records[('2024001', '000001')]['金额'] == 150.0
+        assert dao.find_by_invoices([('2023002', '000002')])[('2023002', '000002')]['金额'] == 200.0
+        assert dao.find_by_invoices([]) == {}
+
     def test_find_by_year(self, populated_db):
         """测试按年份查找。"""
         dao = ODSDetailDAO(populated_db, "TEST")
@@ -304,6 +418,28 @@ class TestODSDetailDAO:
         count_2023 = dao.count_by_year('2023')
         assert count_2023 == 3
 
+    def test_init_creates_indexes(self, populated_db):
+        """测试初始化时补建年份/发票键索引，年份去重不再排序。"""
+        ODSDetailDAO(populated_db, "TEST")
+        result = populated_db.execute_select(
+            "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name=?",
+            ('ODS_TEST_DETAIL',)
+        )
+        names = {row[0] for row in result.rows}
+        assert 'IDX_ODS_TEST_DETAIL_YEAR' in names
+        assert 'IDX_ODS_TEST_DETAIL_INVOICE' in names
+
+        plan = populated_db.execute_pragma(
+            "EXPLAIN QUERY PLAN SELECT 开票年份 FROM ODS_TEST_DETAIL "
+            "WHERE 开票年份 IS NOT NULL GROUP BY 开票年份 ORDER BY 开票年份"
+        )
+        assert not any('TEMP B-TREE' in str(row[-1]) for row in plan.rows)
+
+    def test_init_without_table(self, db_connection):
+        """测试表不存在时初始化不报错。"""
+        dao = ODSHeaderDAO(db_connection, "MISSING")
+        assert dao.table_exists() is False
+
 
 class TestLedgerDAO:
     """测试 LedgerDAO 类。"""
@@ -0,0 +1,24 @@
+import pandas as pd
+
+from vat_audit_pipeline.utils.encoding import read_csv_with_encoding_detection
+
+
+def test_read_csv_keeps_c_engine_dtypes_for_date_columns(tmp_path):
+    path = tmp_path / 'dates.csv'
+    path.write_text('开票日期,时间,金额\n2024-01-05,2024-01-05 10:00:00,1\n2024-01-06,2024-01-06,\n', encoding='utf-8')
+
+    df = read_csv_with_encoding_detection(str(path), encoding='utf-8')
+    expected = pd.read_csv(path, encoding='utf-8', engine='c')
+    assert dict(df.dtypes) == dict(expected.dtypes)
+    assert df['开票日期'].tolist() == ['2024-01-05', '2024-01-06']
+    assert df['时间'].tolist() == ['2024-01-05 10:00:00', '2024-01-06']
+
+
+def test_read_csv_explicit_pyarrow_falls_back_for_unsupported_kwargs(tmp_path):
+    path = tmp_path / 'rows.csv'
+    path.write_text('a,b\n1,x\n2,y\n', encoding='utf-8')
+
+    df = read_csv_with_encoding_detection(str(path), encoding='utf-8', engine='pyarrow')
+    assert df['a'].tolist() == [1, 2]
+    chunks = list(read_csv_with_encoding_detection(str(path), encoding='utf-8', engine='pyarrow', chunksize=1))
+    assert [len(c) for c in chunks] == [1, 1]
@@ -157,11 +157,36 @@ class TestDatabaseExceptions:
         assert exc.category == ErrorCategory.DATABASE_QUERY
         assert "SELECT" in exc.context['query']
 
+    def test_database_error_query_truncated_on_output(self):
+        """测试长 SQL 仅在输出时截断"""
+        query = "SELECT " + ", ".join(f"col_{i}" for i in range(100)) + " FROM invoices"
+        exc = DatabaseQueryError("语法错误", query=query)
+        assert exc.context['query'] == query
+        assert len(exc.to_dict()['context']['query']) == 100
+
     def test_database_transaction_error(self):
         """测试事务错误"""
         exc = DatabaseTransactionError("提交失败")
         assert exc.category == ErrorCategory.DATABASE_TRANSACTION
 
+    def test_exceptions_pickle_round_trip(self):
+        """测试异常跨进程（pickle）往返后消息、上下文与时间戳保持不变"""
+        import pickle
+
+        for exc in (
+            DatabaseQueryError("q failed", "SELECT 1"),
+            FileReadError("data.csv", "无法读取文件", IOError("IO 错误")),
+        ):
+            back = pickle.loads(pickle.dumps(exc))
+            assert type(back) is type(exc)
+            assert back.message == exc.message and str(back) == str(exc)
+            assert back.args == exc.args
+            assert back.context == exc.context
+            assert back.category == exc.category and back.level == exc.level
+            assert back.timestamp == exc.timestamp
+            assert back.to_dict() == exc.to_dict()
+        assert back.file_path == "data.csv"
+
 
 class TestDataExceptions:
     """测试数据相关异常"""
@@ -406,6 +431,20 @@ class TestErrorCollector:
         collector.clear()
         assert collector.has_errors() is False
         assert len(collector.errors) == 0
+        assert collector.has_errors_of_category(ErrorCategory.FILE_READ) is False
+        assert collector.get_statistics().by_category == {}
+
+    def test_report_groups_multiple_categories(self):
+        """测试多分类错误报告统计"""
+        collector = ErrorCollector(auto_log=False)
+        collector.collect(FileReadError("a.txt", "读取失败"))
+        collector.collect(DatabaseQueryError("查询失败"))
+        collector.collect(FileReadError("b.txt", "读取失败"))
+
+        assert [e.file_path for e in collector.get_errors_by_category(ErrorCategory.FILE_READ)] == ["a.txt", "b.txt"]
+        report = collector.get_report(detailed=False)
+        assert "FILE_READ: 2 个" in report
+        assert "DB_QUERY: 1 个" in report
 
     def test_export_to_file(self):
         """测试导出到文件"""
@@ -431,6 +470,19 @@ class TestErrorCollector:
         
         assert "未发现错误" in report
 
+    def test_level_threshold_and_names(self):
+        """测试级别按严重程度比较，对外输出仍为名称"""
+        assert ErrorLevel.CRITICAL > ErrorLevel.ERROR > ErrorLevel.WARNING > ErrorLevel.INFO
+
+        collector = ErrorCollector(auto_log=False)
+        collector.collect(FileReadError("a.txt", "读取失败"))
+        assert collector.has_errors_at_least(ErrorLevel.WARNING)
+        assert not collector.has_errors_at_least(ErrorLevel.CRITICAL)
+
+        assert collector.errors[0].to_dict()["level"] == "ERROR"
+        assert collector.get_statistics().by_level == {"ERROR": 1}
+        assert "[ERROR]" in collector.get_report()
+
 
 class TestErrorStatistics:
     """测试错误统计"""
@@ -484,6 +536,16 @@ class TestExceptionConversion:
         assert result.category == ErrorCategory.MEMORY_ERROR
         assert result.level == ErrorLevel.CRITICAL
 
+    def test_convert_by_type_and_message(self):
+        """测试按异常类型和消息关键字转换"""
+        import sqlite3
+
+        assert isinstance(convert_exception_to_vat_error(sqlite3.OperationalError("no such table: t")), DatabaseQueryError)
+        assert isinstance(convert_exception_to_vat_error(ValueError("SQL logic error")), DatabaseQueryError)
+        result = convert_exception_to_vat_error(ValueError("bad XLSX header"), file_path="a.xlsx")
+        assert isinstance(result, ExcelParseError)
+        assert result.context["file_path"] == "a.xlsx"
+
     def test_convert_generic_exception(self):
         """测试转换通用异常"""
         orig = ValueError("一些错误")
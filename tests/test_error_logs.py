@@ -17,4 +17,38 @@ def test_write_error_logs_writes_csv_and_json(tmp_path):
     assert data[0]['file'] == 'a.xlsx'
     # ensure suggestion field exists and for FileNotFoundError contains expected hint
     assert 'suggestion' in data[0]
-    assert '检查文件路径' in data[0]['suggestion'] or '存在' in data[0]['suggestion']
\ No newline at end of file
+    assert '检查文件路径' in data[0]['suggestion'] or '存在' in data[0]['suggestion']
+
+def test_write_error_logs_fills_suggestions_like_scalar_helper(tmp_path):
+    from vat_audit_pipeline.utils.validators import suggest_remedy_for_error
+
+    errors = [
+        {'error_type': 'Foo', 'message': 'Permission denied'},
+        {'error_type': 'Bar', 'message': 'File NOT FOUND'},
+        {'error_type': 'Baz', 'message': 'database is locked'},
+        {'error_type': None, 'message': 'permission'},
+        {'error_type': 'Z', 'message': 'other', 'suggestion': 'keep'},
+    ]
+    _, json_p = write_error_logs(errors, '2026-01-02 03:00:00', output_dir=str(tmp_path))
+    with open(json_p, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    expected = [e.get('suggestion') or suggest_remedy_for_error(e['error_type'], e['message']) for e in errors]
+    assert [d['suggestion'] for d in data] == expected
+    assert expected[0] and expected[1] and expected[2] and expected[3] == ''
+
+
+def test_write_error_logs_json_keeps_original_records(tmp_path):
+    from vat_audit_pipeline.utils.validators import suggest_remedy_for_error
+
+    errors = [
+        {'stage': 'merge_chunk', 'file': 'C:/data/a.xlsx', 'chunk_no': 3, 'error_type': 'ValueError', 'message': 'bad'},
+        {'stage': 'read', 'file': 'b.xlsx', 'error_type': 'ValueError', 'message': 'bad', 'suggestion': 'keep'},
+    ]
+    _, json_p = write_error_logs(errors, '2026-01-02 03:00:00', output_dir=str(tmp_path))
+    with open(json_p, 'r', encoding='utf-8') as f:
+        text = f.read()
+    data = json.loads(text)
+    assert data == [dict(errors[0], suggestion=suggest_remedy_for_error('ValueError', 'bad')), errors[1]]
+    assert type(data[0]['chunk_no']) is int
+    assert 'chunk_no' not in data[1]
+    assert '"file": "C:/data/a.xlsx"' in text
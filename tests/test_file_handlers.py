@@ -0,0 +1,109 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from vat_audit_pipeline.core import models
+from vat_audit_pipeline.utils.file_handlers import (
+    add_audit_columns,
+    add_dedup_capture_time,
+    add_invoice_year_column,
+    cleanup_old_temp_files,
+    filter_dataframe_columns,
+    list_files,
+)
+
+
+def test_add_invoice_year_column_from_strings():
+    df = pd.DataFrame({models.INVOICE_DATE_COL: ['2021-01-01', '2022-12-31', np.nan]})
+    out = add_invoice_year_column(df)
+    assert out[models.INVOICE_YEAR_COL].tolist()[:2] == ['2021', '2022']
+    assert pd.isna(out[models.INVOICE_YEAR_COL].iloc[2])
+
+
+def test_add_invoice_year_column_from_datetimes():
+    df = pd.DataFrame({models.INVOICE_DATE_COL: pd.to_datetime(['2023-05-01', None])})
+    out = add_invoice_year_column(df)
+    assert out[models.INVOICE_YEAR_COL].iloc[0] == '2023'
+    assert pd.isna(out[models.INVOICE_YEAR_COL].iloc[1])
+
+
+def test_add_invoice_year_column_missing_date():
+    df = pd.DataFrame({'发票代码': ['A1']})
+    out = add_invoice_year_column(df)
+    assert out[models.INVOICE_YEAR_COL].isna().all()
+
+
+def test_list_files_matches_name_and_recursive_patterns(tmp_path):
+    (tmp_path / 'b.xlsx').write_text('')
+    (tmp_path / 'a.xls').write_text('')
+    (tmp_path / 'notes.txt').write_text('')
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'sub' / 'c.xlsx').write_text('')
+
+    assert list_files(tmp_path, ['*.xlsx', '*.xls']) == [tmp_path / 'a.xls', tmp_path / 'b.xlsx']
+    assert list_files(tmp_path, ['**/*.xlsx']) == [tmp_path / 'b.xlsx', tmp_path / 'sub' / 'c.xlsx']
+    assert list_files(tmp_path / 'missing', ['*.xlsx']) == []
+
+
+def test_add_audit_columns_uses_categorical(tmp_path):
+    df = add_audit_columns(pd.DataFrame({'发票代码': ['A1', 'A2', 'A3']}), 'src.xlsx', '2026-01-01 00:00:00')
+    assert isinstance(df[models.AUDIT_SRC_FILE_COL].dtype, pd.CategoricalDtype)
+    assert df[models.AUDIT_SRC_FILE_COL].tolist() == ['src.xlsx'] * 3
+    assert df[models.AUDIT_IMPORT_TIME_COL].tolist() == ['2026-01-01 00:00:00'] * 3
+
+    out_path = tmp_path / 'out.csv'
+    df.to_csv(out_path, index=False)
+    assert pd.read_csv(out_path)[models.AUDIT_SRC_FILE_COL].tolist() == ['src.xlsx'] * 3
+
+
+def test_cleanup_old_temp_files_removes_only_stale_dirs(tmp_path):
+    stale = tmp_path / 'worker_1'
+    fresh = tmp_path / 'worker_2'
+    stale.mkdir()
+    fresh.mkdir()
+    (tmp_path / 'keep.csv').write_text('')
+    old = time.time() - 48 * 3600
+    os.utime(stale, (old, old))
+
+    cleanup_old_temp_files(str(tmp_path), max_age_hours=24)
+
+    assert not stale.exists()
+    assert fresh.exists()
+    assert (tmp_path / 'keep.csv').exists()
+
+
+def test_add_invoice_year_column_non_ascii_and_short_strings():
+    df = pd.DataFrame({models.INVOICE_DATE_COL: ['2024年05月17日', '20', None, '2023-01-01 08:00:00']})
+    out = add_invoice_year_column(df)
+    assert out[models.INVOICE_YEAR_COL].tolist()[:2] == ['2024', '20']
+    assert pd.isna(out[models.INVOICE_YEAR_COL].iloc[2])
+
+    df = pd.DataFrame({models.INVOICE_DATE_COL: ['20', None, '2023-01-01 08:00:00']})
+    out = add_invoice_year_column(df)
+    assert out[models.INVOICE_YEAR_COL].iloc[0] == '20'
+    assert pd.isna(out[models.INVOICE_YEAR_COL].iloc[1])
+    assert out[models.INVOICE_YEAR_COL].iloc[2] == '2023'
+
+
+def test_add_dedup_capture_time_columns():
+    df = add_dedup_capture_time(pd.DataFrame({'发票代码': ['A1', 'A2']}), '2026-01-02 03:04:05')
+    assert isinstance(df[models.DEDUP_CAPTURE_TIME_COL].dtype, pd.CategoricalDtype)
+    assert df[models.DEDUP_CAPTURE_TIME_COL].tolist() == ['2026-01-02 03:04:05'] * 2
+    assert df[models.AUDIT_IMPORT_TIME_COL].isna().all()
+
+    existing = pd.DataFrame({models.AUDIT_IMPORT_TIME_COL: ['t0']})
+    assert add_dedup_capture_time(existing, 't1')[models.AUDIT_IMPORT_TIME_COL].tolist() == ['t0']
+
+
+def test_filter_dataframe_columns_paths():
+    df = pd.DataFrame({'a': [1], 'b': [2]})
+    assert filter_dataframe_columns(df, ['a', 'b']) is df
+    assert list(filter_dataframe_columns(df, ['b', 'a']).columns) == ['b', 'a']
+    out = filter_dataframe_columns(df, ['b', 'c'])
+    assert list(out.columns) == ['b', 'c']
+    assert pd.isna(out['c'].iloc[0])
+    assert out['c'].dtype == df.reindex(columns=['b', 'c'])['c'].dtype
+    out = filter_dataframe_columns(df, ['c', 'a', 'd'])
+    assert list(out.columns) == ['c', 'a', 'd'] and out['a'].tolist() == [1]
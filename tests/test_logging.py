@@ -24,4 +24,44 @@ def test_log_file_created_and_contains_message(tmp_path):
     # Check that the file contains our message
     with open(LOG_FILE, 'r', encoding='utf-8') as f:
         content = f.read()
-    assert 'pytest logging probe - logging up' in content
\ No newline at end of file
+    assert 'pytest logging probe - logging up' in content
+
+
+def test_progress_logger_batches_messages():
+    import logging
+
+    from vat_audit_pipeline.utils.logging import ProgressLogger
+
+    records = []
+
+    class _Capture(logging.Handler):
+        def emit(self, record):
+            records.append(record.getMessage())
+
+    handler = _Capture()
+    progress_logger = logging.getLogger("vat_audit")
+    progress_logger.addHandler(handler)
+    previous_level = progress_logger.level
+    progress_logger.setLevel(logging.INFO)
+    try:
+        with ProgressLogger(total=5, use_tqdm=False, flush_every=2) as pbar:
+            for i in range(5):
+                pbar.update(1, msg=f"step {i}")
+            assert records == ["step 0\nstep 1", "step 2\nstep 3"]
+        assert records[-1] == "step 4"
+        assert pbar.current == 5
+    finally:
+        progress_logger.setLevel(previous_level)
+        progress_logger.removeHandler(handler)
+
+
+def test_performance_timer_measures_elapsed():
+    from vat_audit_pipeline.utils.logging import PerformanceTimer
+
+    timer = PerformanceTimer("probe")
+    assert timer.get_elapsed() == 0.0
+    with timer:
+        time.sleep(0.01)
+        assert timer.get_elapsed() > 0
+    assert timer.elapsed_seconds >= 0.01
+    assert timer.get_elapsed() == timer.elapsed_seconds
@@ -12,6 +12,40 @@ def test_normalize_excel_date_col():
     assert converted >= 1
 
 
+def test_normalize_excel_date_col_repeated_values_keep_positions():
+    s = pd.Series(['2021-01-01', None, '2021-03-05', '2021-01-01'], index=[10, 11, 12, 13])
+    parsed, method, converted, failed = normalize_excel_date_col(s)
+    assert list(parsed.index) == [10, 11, 12, 13]
+    assert parsed.tolist()[0] == '2021-01-01' and parsed.tolist()[2:] == ['2021-03-05', '2021-01-01']
+    assert pd.isna(parsed.iloc[1])
+    assert (converted, failed) == (3, 1)
+
+
+def test_normalize_excel_date_col_numeric_and_sniffed_formats():
+    parsed, method, converted, failed = normalize_excel_date_col(pd.Series([44197, 44198]))
+    assert parsed.tolist() == ['2021-01-01', '2021-01-02']
+    assert method == 'excel_1899-12-30'
+
+    # 个别超出范围的序列号只影响自身，不会让整列转换失败
+    parsed, method, converted, failed = normalize_excel_date_col(pd.Series([44197.0, 44197.75, 1e20, 44198.0]))
+    assert parsed.tolist()[:2] == ['2021-01-01', '2021-01-01'] and parsed.iloc[3] == '2021-01-02'
+    assert pd.isna(parsed.iloc[2]) and method == 'excel_1899-12-30' and failed == 1
+
+    parsed, method, converted, failed = normalize_excel_date_col(pd.Series([20210101, 20210102]))
+    assert parsed.tolist() == ['2021-01-01', '2021-01-02']
+
+    parsed, method, converted, failed = normalize_excel_date_col(pd.Series(['2021年01月05日', '2021年12月31日']))
+    assert parsed.tolist() == ['2021-01-05', '2021-12-31']
+    assert method == 'pd.to_datetime'
+
+    parsed, method, converted, failed = normalize_excel_date_col(pd.Series(['2021.03.04', '2021.11.30']))
+    assert parsed.tolist() == ['2021-03-04', '2021-11-30']
+
+    parsed, method, converted, failed = normalize_excel_date_col(pd.Series(['2021-01-01 10:00:00', '2021-01-02']))
+    assert parsed.tolist() == ['2021-01-01', '2021-01-02']
+    assert failed == 0
+
+
 def test_normalize_numeric_col():
     s = pd.Series(['1,234.56', '  1000 ', 'n/a', ''])
     parsed, converted, failed = normalize_numeric_col(s)
@@ -19,6 +53,31 @@ def test_normalize_numeric_col():
     assert converted >= 2
 
 
+def test_normalize_numeric_col_numeric_and_mixed_inputs():
+    parsed, converted, failed = normalize_numeric_col(pd.Series([1, 2, 3]))
+    assert parsed.tolist() == [1, 2, 3] and (converted, failed) == (3, 0)
+
+    parsed, converted, failed = normalize_numeric_col(pd.Series([1, '2,000', None, '12%', '1，000'], index=[3, 4, 5, 6, 7]))
+    assert list(parsed.index) == [3, 4, 5, 6, 7]
+    assert parsed.tolist()[:2] == [1.0, 2000.0] and parsed.tolist()[3:] == [12.0, 1000.0]
+    assert (converted, failed) == (4, 1)
+
+
+def test_bulk_numeric_normalize_matches_single_column():
+    from vat_audit_pipeline.utils.normalization import bulk_numeric_normalize
+    df = pd.DataFrame({
+        '金额': ['1,234.56', ' 10 ', 'n/a', None],
+        '税额': [1.5, 2.0, None, 4.0],
+        '数量': ['3', '4%', '5，0', ''],
+    }, index=[7, 8, 9, 10])
+    out = bulk_numeric_normalize(df, ['金额', '税额', '数量', '单价'])
+    assert list(out) == ['金额', '税额', '数量']
+    for c, (parsed, converted, failed) in out.items():
+        exp_parsed, exp_converted, exp_failed = normalize_numeric_col(df[c])
+        pd.testing.assert_series_equal(parsed, exp_parsed)
+        assert (converted, failed) == (exp_converted, exp_failed)
+
+
 def test_normalize_tax_rate_col():
     s = pd.Series(['13%', '免税', '0', '3%','abc'])
     num, method, converted, failed, text_count, mask_text = normalize_tax_rate_col(s)
@@ -27,6 +86,15 @@ def test_normalize_tax_rate_col():
     assert failed >= 1
 
 
+def test_normalize_tax_rate_col_numeric_input():
+    s = pd.Series([13.0, None, 0.0])
+    num, method, converted, failed, text_count, mask_text = normalize_tax_rate_col(s)
+    expected = normalize_tax_rate_col(s.astype(object))
+    pd.testing.assert_series_equal(num, expected[0])
+    assert (converted, failed, text_count) == expected[2:5] == (2, 0, 0)
+    assert not mask_text.any()
+
+
 def test_cast_and_record_creates_tax_numeric(tmp_path):
     df = pd.DataFrame({
         '发票代码': ['A1','A2'],
@@ -43,6 +111,23 @@ def test_cast_and_record_creates_tax_numeric(tmp_path):
     assert df2['税率_数值'].iloc[1] == 13.0
 
 
+def test_cast_and_record_collects_date_failures_in_one_frame():
+    df = pd.DataFrame({
+        '发票代码': ['A1', 'A2', 'A3'],
+        '发票号码': ['001', '002', '003'],
+        '开票日期': ['2021-01-01', 'bad', 'worse'],
+    }, index=[5, 6, 7])
+    cast_stats = []
+    cast_failures = []
+    cast_and_record(df, 'test.xlsx', '信息汇总表', cast_stats, cast_failures)
+    assert len(cast_failures) == 1
+    failures = cast_failures[0]
+    assert failures['row_index'].tolist() == [6, 7]
+    assert failures['orig_value'].tolist() == ['bad', 'worse']
+    assert failures['发票号码'].tolist() == ['002', '003']
+    assert set(failures['column']) == {'开票日期'}
+
+
 if __name__ == '__main__':
     import pytest
     pytest.main([os.path.abspath(__file__)])
@@ -0,0 +1,46 @@
+import operator
+
+from vat_audit_pipeline.utils.parallel import (
+    calculate_optimal_workers,
+    map_concurrent,
+    map_concurrent_procs,
+    measure_disk_busy_percent,
+)
+
+
+def test_map_concurrent_preserves_order():
+    assert map_concurrent(abs, [-3, 2, -1], max_workers=2) == [3, 2, 1]
+
+
+def test_map_concurrent_unordered_collects_in_completion_order():
+    import time
+
+    def work(delay):
+        time.sleep(delay)
+        return delay
+
+    assert map_concurrent(work, [0.2, 0.0], max_workers=2, ordered=False) == [0.0, 0.2]
+    assert map_concurrent(work, [0.2, 0.0], max_workers=2) == [0.2, 0.0]
+
+
+def test_map_concurrent_procs_preserves_order():
+    assert map_concurrent_procs(operator.neg, [1, 2, 3], max_workers=2) == [-1, -2, -3]
+    assert map_concurrent_procs(operator.neg, [1, 2, 3], max_workers=2, chunksize=2) == [-1, -2, -3]
+    assert map_concurrent_procs(operator.neg, [], max_workers=2) == []
+
+
+def test_calculate_optimal_workers_throttles_on_busy_disk():
+    files = ['a.xlsx', 'b.xlsx', 'c.xlsx', 'd.xlsx']
+    assert calculate_optimal_workers(files, 4) == 4
+    assert calculate_optimal_workers(files, 4, disk_busy_percent=90) == 2
+    assert calculate_optimal_workers(files[:1], 'auto') == 1
+
+
+def test_measure_disk_busy_percent_reuses_recent_sample():
+    import time
+
+    first = measure_disk_busy_percent(sample_seconds=0.05, max_age=0)
+    start = time.perf_counter()
+    second = measure_disk_busy_percent(sample_seconds=0.5)
+    assert time.perf_counter() - start < 0.25
+    assert second == first
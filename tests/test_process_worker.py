@@ -29,6 +29,35 @@ def test_process_file_worker(tmp_path):
     # temp csvs should be generated
     assert any(os.path.exists(t['path']) for t in res.get('temp_csvs',[]))
 
+
+def test_process_file_worker_spills_by_configured_format(tmp_path):
+    import sqlite3
+    from vat_audit_pipeline.core.processors.ods_processor import _save_spill_dataframe, merge_temp_csvs_to_db
+    from vat_audit_pipeline.utils.sheet_processing import resolve_spill_format
+
+    sample = tmp_path / 'sample.xlsx'
+    create_sample_excel(str(sample))
+    meta = {
+        'sheet_info': {}, 'detail_sheets': [], 'header_sheets': ['发票基础信息'],
+        'summary_sheets': [], 'special_sheets': {},
+    }
+    temp_dir = str(tmp_path / 'out')
+    os.makedirs(temp_dir, exist_ok=True)
+    header_cols = ['发票代码', '发票号码', '开票日期', '金额']
+    res = process_file_worker((str(sample), meta, temp_dir, '2026-01-01 00:00:00', [], header_cols, [], {}))
+    paths = [t['path'] for t in res['temp_csvs']]
+    expected_ext = '.parquet' if resolve_spill_format('parquet') == 'parquet' else '.csv'
+    assert len(paths) == 1 and paths[0].endswith(expected_ext) and os.path.exists(paths[0])
+
+    conn = sqlite3.connect(tmp_path / 'db.sqlite')
+    merge_temp_csvs_to_db(temp_dir, conn, {'ODS_VAT_INV_HEADER': header_cols}, 1000, 'VAT_INV', [])
+    assert conn.execute('SELECT 发票代码 FROM ODS_VAT_INV_HEADER').fetchall() == [('H1',)]
+    conn.close()
+
+    csv_path = str(tmp_path / 'x.csv')
+    assert _save_spill_dataframe(pd.DataFrame({'a': [1]}), 'T', csv_path, 'csv') == csv_path
+    assert pd.read_csv(csv_path, encoding='utf-8-sig')['a'].tolist() == [1]
+
 if __name__ == '__main__':
     import pytest
     pytest.main([str(__file__)])
@@ -15,3 +15,17 @@ def test_write_resource_report(tmp_path):
     data = json.loads(out.read_text(encoding="utf-8"))
     assert "memory" in data
     assert "cpu" in data
+
+
+def test_resource_monitor_summarizes_samples():
+    monitor = ResourceMonitor()
+    monitor.memory_samples.extend([{"rss_mb": 10.0}, {"rss_mb": 30.0}])
+    monitor.sample_memory()
+    report = monitor.generate_report()
+
+    rss = report["memory"]["rss_mb"]
+    assert report["memory"]["samples"] == len(monitor.memory_samples)
+    assert rss["min"] == 10.0
+    assert rss["max"] >= 30.0
+    assert rss["min"] <= rss["avg"] <= rss["max"]
+    assert report["cpu"]["system_percent"] == {"min": 0.0, "max": 0.0, "avg": 0.0}
@@ -0,0 +1,89 @@
+import pandas as pd
+
+from vat_audit_pipeline.utils.sheet_processing import normalize_sheet_dataframe
+
+
+def _identity_cast(df, fname, sheet, cast_stats, cast_failures):
+    return df
+
+
+def test_normalize_sheet_dataframe_extracts_year():
+    df = pd.DataFrame({'发票号码': ['001', '002'], '开票日期': ['2021-01-01', None]})
+    out, rows = normalize_sheet_dataframe(
+        df, '信息汇总表', 'a.xlsx', '2026-01-01 00:00:00',
+        ['发票号码', '开票日期', '开票年份', 'AUDIT_SRC_FILE'], _identity_cast, [], [], [],
+    )
+    assert rows == 2
+    assert list(out.columns) == ['发票号码', '开票日期', '开票年份', 'AUDIT_SRC_FILE']
+    assert out['开票年份'].iloc[0] == '2021'
+    assert pd.isna(out['开票年份'].iloc[1])
+    assert out['AUDIT_SRC_FILE'].tolist() == ['a.xlsx', 'a.xlsx']
+
+
+def test_write_to_csv_or_queue_round_trips_csv(tmp_path):
+    from vat_audit_pipeline.utils.sheet_processing import write_to_csv_or_queue
+
+    df = pd.DataFrame({'发票号码': ['001', None], '金额': [1000.5, 2.0], '备注': ['a,"b"', 'c']})
+    path = tmp_path / 'out.csv'
+    queued, _ = write_to_csv_or_queue(df, 'T', str(path), None, use_csv_fallback=True)
+    assert not queued
+    assert path.read_bytes().startswith(b'\xef\xbb\xbf')
+    back = pd.read_csv(path, encoding='utf-8-sig', dtype={'发票号码': str})
+    assert back['金额'].tolist() == [1000.5, 2.0]
+    assert back['备注'].tolist() == ['a,"b"', 'c']
+    assert back['发票号码'].iloc[0] == '001' and pd.isna(back['发票号码'].iloc[1])
+
+    # 混合类型 object 列无法转为 Arrow 表，回退 pandas 写出
+    mixed = pd.DataFrame({'发票号码': [1, 'A2']})
+    write_to_csv_or_queue(mixed, 'T', str(path), None, use_csv_fallback=True)
+    assert pd.read_csv(path, encoding='utf-8-sig', dtype=str)['发票号码'].tolist() == ['1', 'A2']
+
+
+def test_parquet_spill_merges_into_db(tmp_path):
+    import sqlite3
+
+    from vat_audit_pipeline.core.processors.ods_processor import merge_temp_csvs_to_db
+    from vat_audit_pipeline.utils.sheet_processing import resolve_spill_format, write_to_csv_or_queue
+
+    assert resolve_spill_format('csv') == 'csv'
+    if resolve_spill_format('parquet') != 'parquet':
+        return
+
+    df = pd.DataFrame({'发票号码': [1, 'A2'], '金额': [1.5, 2.0]})
+    path = tmp_path / 'HEADER__a.xlsx__s1__x.parquet'
+    queued, msg = write_to_csv_or_queue(df, 'T', str(path), None, use_csv_fallback=True)
+    assert not queued and 'Parquet' in msg
+
+    conn = sqlite3.connect(tmp_path / 'db.sqlite')
+    merge_temp_csvs_to_db(str(tmp_path), conn, {'ODS_VAT_INV_HEADER': ['发票号码', '金额']}, 1000, 'VAT_INV', [])
+    rows = conn.execute('SELECT 发票号码, 金额 FROM ODS_VAT_INV_HEADER').fetchall()
+    conn.close()
+    assert rows == [('1', 1.5), ('A2', 2.0)]
+
+
+def test_normalize_sheet_dataframe_categorizes_repetitive_columns():
+    df = pd.DataFrame({'发票代码': ['A1'] * 5, '发票号码': ['1', '2', '3', '4', '5'], '商品名称': ['x', 'x', 'y', 'x', 'x']})
+    out, _ = normalize_sheet_dataframe(
+        df, 's', 'a.xlsx', 't', ['发票代码', '发票号码', '商品名称', 'AUDIT_SRC_FILE'], _identity_cast, [], [], [],
+    )
+    assert isinstance(out['发票代码'].dtype, pd.CategoricalDtype)
+    assert isinstance(out['商品名称'].dtype, pd.CategoricalDtype)
+    assert out['发票号码'].dtype == object
+    assert isinstance(out['AUDIT_SRC_FILE'].dtype, pd.CategoricalDtype)
+    assert out['商品名称'].tolist() == ['x', 'x', 'y', 'x', 'x']
+
+
+def test_parquet_spill_handles_mixed_type_categorical_column(tmp_path):
+    from vat_audit_pipeline.utils.sheet_processing import resolve_spill_format, write_to_csv_or_queue
+
+    if resolve_spill_format('parquet') != 'parquet':
+        return
+
+    df = pd.DataFrame({'发票号码': [123, 'A1'] * 10})
+    out, _ = normalize_sheet_dataframe(df, 's', 'a.xlsx', 't', ['发票号码'], _identity_cast, [], [], [])
+    assert isinstance(out['发票号码'].dtype, pd.CategoricalDtype)
+
+    path = tmp_path / 'x.parquet'
+    queued, msg = write_to_csv_or_queue(out, 'T', str(path), None, use_csv_fallback=True)
+    assert not queued and 'Parquet' in msg
+    assert pd.read_parquet(path)['发票号码'].tolist() == ['123', 'A1'] * 10
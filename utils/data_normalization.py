@@ -5,6 +5,7 @@ This module re-exports the public symbols for older import paths.
 """
 
 from vat_audit_pipeline.utils.normalization import (  # noqa: F401
+    bulk_numeric_normalize,
     cast_and_record,
     normalize_excel_date_col,
     normalize_numeric_col,
@@ -15,5 +16,6 @@ __all__ = [
     "normalize_excel_date_col",
     "normalize_numeric_col",
     "normalize_tax_rate_col",
+    "bulk_numeric_normalize",
     "cast_and_record",
 ]
@@ -10,6 +10,7 @@ from vat_audit_pipeline.utils.sheet_processing import (  # noqa: F401
     SheetTypeMapping,
     get_sheet_handler,
     normalize_sheet_dataframe,
+    resolve_spill_format,
     write_to_csv_or_queue,
 )
 
@@ -19,6 +20,7 @@ __all__ = [
     "SheetTypeMapping",
     "get_sheet_handler",
     "normalize_sheet_dataframe",
+    "resolve_spill_format",
     "write_to_csv_or_queue",
 ]
 
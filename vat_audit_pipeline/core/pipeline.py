@@ -138,13 +138,20 @@ def build_logger(base_dir: Path, output_dir: Path, debug: bool = False) -> loggi
 
 
 class VATAuditPipeline:
-    def __init__(self, config_path: str | None = None, input_dir: str | None = None, verbose: bool = False) -> None:
+    def __init__(
+        self,
+        config_path: str | None = None,
+        input_dir: str | None = None,
+        verbose: bool = False,
+        overrides: Dict[str, Any] | None = None,
+    ) -> None:
         self.process_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         self.base_dir = Path(__file__).resolve().parent.parent
         self.app_settings: AppSettings = load_app_settings()
         self.config_path = config_path
         self.cli_input_dir = input_dir
         self.verbose = verbose
+        self.config_overrides = overrides
 
         self.config = self._load_external_config()
         self.settings = build_pipeline_settings(self.config, self.base_dir)
@@ -221,6 +228,12 @@ class VATAuditPipeline:
                 overrides.setdefault("paths", {})["output_dir"] = env_output_dir
             if env_database_dir:
                 overrides.setdefault("paths", {})["database_dir"] = env_database_dir
+            # 调用方直接传入的覆盖项（GUI）优先于环境变量
+            for section, values in (self.config_overrides or {}).items():
+                if isinstance(values, dict):
+                    overrides.setdefault(section, {}).update(values)
+                else:
+                    overrides[section] = values
 
             cfg = get_config_with_overrides(config_path=self.config_path, overrides=overrides or None)
             return cfg
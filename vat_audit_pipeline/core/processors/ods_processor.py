@@ -133,6 +133,7 @@ from vat_audit_pipeline.utils.file_handlers import (
     generate_manifest_filename,
     register_cleanup,
     save_dataframe_to_csv,
+    select_invoice_key_columns,
 )
 from vat_audit_pipeline.utils.parallel import calculate_optimal_workers, measure_disk_busy_percent
 from vat_audit_pipeline.utils.validators import validate_input_file
@@ -145,6 +146,7 @@ from vat_audit_pipeline.utils.sheet_processing import (
     SheetTypeMapping,
     get_sheet_handler,
     normalize_sheet_dataframe,
+    resolve_spill_format,
     write_to_csv_or_queue,
 )
 
@@ -362,6 +364,31 @@ def stream_read_and_write_csv(
     return written
 
 
+def _spill_path(temp_csv_path: str, spill_format: str) -> str:
+    """整表落盘的实际路径：parquet 格式时把 .csv 后缀换为 .parquet。"""
+
+    if spill_format == "parquet":
+        return os.path.splitext(temp_csv_path)[0] + ".parquet"
+    return temp_csv_path
+
+
+def _save_spill_dataframe(df: pd.DataFrame, target_table: str, temp_csv_path: str, spill_format: str) -> str:
+    """非流式 sheet 整表落盘，返回实际写入的路径；写 Parquet 时内存不足会先删除残缺文件再抛出。"""
+
+    spill_path = _spill_path(temp_csv_path, spill_format)
+    if spill_path == temp_csv_path:
+        save_dataframe_to_csv(df, temp_csv_path)
+        return temp_csv_path
+    try:
+        write_to_csv_or_queue(df, target_table, spill_path, None, use_csv_fallback=True)
+    except MemoryError:
+        # 调用方会改用流式写 CSV，残缺的 Parquet 若留在临时目录会被合并步骤读到
+        if os.path.exists(spill_path):
+            os.remove(spill_path)
+        raise
+    return spill_path
+
+
 def process_single_sheet(
     excel_file: str,
     sheet_name: str,
@@ -377,6 +404,7 @@ def process_single_sheet(
     use_streaming: bool,
     tax_text_to_zero: bool,
     stream_chunk_size: int,
+    spill_format: str = "csv",
 ) -> Tuple[int, str, str]:
     if handler is None:
         return 0, "ignored", ""
@@ -417,10 +445,12 @@ def process_single_sheet(
             extract_year=True,
         )
 
-        queued, msg = write_to_csv_or_queue(df, handler.target_table, temp_csv_path, df_queue, use_csv_fallback)
+        # 流式分支逐块追加只能写 CSV；整表落盘时按配置可写 Parquet（保留 dtype，合并时免解析）
+        spill_path = _spill_path(temp_csv_path, resolve_spill_format(spill_format))
+        queued, msg = write_to_csv_or_queue(df, handler.target_table, spill_path, df_queue, use_csv_fallback)
         if queued:
             return rows_written, classification, "queued"
-        return rows_written, classification, temp_csv_path
+        return rows_written, classification, spill_path
 
     except MemoryError:
         rows_written = stream_read_and_write_csv(
@@ -478,6 +508,15 @@ def process_file_worker(args) -> Dict[str, Any]:
     if str(file).lower().endswith(".xls"):
         use_streaming_for_this_file = False
 
+    # 流式分支逐块追加只能写 CSV；整表落盘的 sheet 按配置写 Parquet（保留 dtype，合并时免解析）
+    spill_format = PipelineSettings.spill_format
+    if config and hasattr(config, "get"):
+        try:
+            spill_format = config.get("performance", "spill_format", default=spill_format)
+        except Exception:
+            pass
+    spill_format = resolve_spill_format(spill_format)
+
     try:
         engine = "xlrd" if str(file).lower().endswith(".xls") else None
         with pd.ExcelFile(file, engine=engine) as xl:
@@ -514,7 +553,7 @@ def process_file_worker(args) -> Dict[str, Any]:
                                 if models.INVOICE_DATE_COL in df.columns:
                                     df = add_invoice_year_column(df)
                                 df = filter_dataframe_columns(df, list(target_cols))
-                                save_dataframe_to_csv(df, temp_csv)
+                                temp_csv = _save_spill_dataframe(df, target_table, temp_csv, spill_format)
                                 rows_written = len(df)
                         except MemoryError:
                             rows_written = stream_read_and_write_csv(
@@ -560,7 +599,7 @@ def process_file_worker(args) -> Dict[str, Any]:
                                 if models.INVOICE_DATE_COL in df.columns:
                                     df = add_invoice_year_column(df)
                                 df = filter_dataframe_columns(df, list(target_cols))
-                                save_dataframe_to_csv(df, temp_csv)
+                                temp_csv = _save_spill_dataframe(df, target_table, temp_csv, spill_format)
                                 rows_written = len(df)
                         except MemoryError:
                             rows_written = stream_read_and_write_csv(
@@ -579,7 +618,7 @@ def process_file_worker(args) -> Dict[str, Any]:
                             )
                         result["temp_csvs"].append({"path": temp_csv, "target_table": target_table, "rows": rows_written})
                         try:
-                            key_cols = [c for c in models.INVOICE_KEY_COLS if c in df.columns]
+                            key_cols = select_invoice_key_columns(df)
                             if key_cols:
                                 result["summary_keys"] = df[key_cols].drop_duplicates().to_dict(orient="records")
                         except Exception:
@@ -612,7 +651,7 @@ def process_file_worker(args) -> Dict[str, Any]:
                                 if models.INVOICE_DATE_COL in df.columns:
                                     df = add_invoice_year_column(df)
                                 df = filter_dataframe_columns(df, list(target_cols))
-                                save_dataframe_to_csv(df, temp_csv)
+                                temp_csv = _save_spill_dataframe(df, target_table, temp_csv, spill_format)
                                 rows_written = len(df)
                         except MemoryError:
                             rows_written = stream_read_and_write_csv(
@@ -658,7 +697,7 @@ def process_file_worker(args) -> Dict[str, Any]:
                                 if models.INVOICE_DATE_COL in df.columns:
                                     df = add_invoice_year_column(df)
                                 df = filter_dataframe_columns(df, list(target_cols))
-                                save_dataframe_to_csv(df, temp_csv)
+                                temp_csv = _save_spill_dataframe(df, target_table, temp_csv, spill_format)
                                 rows_written = len(df)
                         except MemoryError:
                             rows_written = stream_read_and_write_csv(
@@ -698,6 +737,30 @@ def process_file_worker(args) -> Dict[str, Any]:
     return result
 
 
+def _is_parquet(path: str) -> bool:
+    return path.lower().endswith(".parquet")
+
+
+def _temp_file_columns(path: str) -> List[str]:
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(path).names
+    return read_csv_with_encoding_detection(path, nrows=0).columns.tolist()
+
+
+def _iter_temp_file_chunks(path: str, chunk_size: int):
+    """按块读取临时落盘文件：Parquet 按 record batch 读取，CSV 走编码探测读取。"""
+
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+        return
+    yield from read_csv_with_encoding_detection(path, chunksize=chunk_size)
+
+
 def merge_temp_csvs_to_db(
     temp_dir: str,
     conn: sqlite3.Connection,
@@ -716,7 +779,7 @@ def merge_temp_csvs_to_db(
     temp_files = []
     for root, _, files in os.walk(temp_dir):
         for f in files:
-            if f.lower().endswith(".csv"):
+            if f.lower().endswith((".csv", ".parquet")):
                 temp_files.append(os.path.join(root, f))
     grouped: Dict[str, List[str]] = {}
     for f in temp_files:
@@ -739,8 +802,7 @@ def merge_temp_csvs_to_db(
                         break
         if not assigned:
             try:
-                df_sample = read_csv_with_encoding_detection(f, nrows=0)
-                cols = set(df_sample.columns.tolist())
+                cols = set(_temp_file_columns(f))
                 for tbl, tbl_cols in table_columns_map.items():
                     if len(cols & set(tbl_cols)) > 0:
                         assigned = tbl
@@ -756,7 +818,7 @@ def merge_temp_csvs_to_db(
             cursor.execute("BEGIN IMMEDIATE")
             for f in files:
                 try:
-                    for chunk_no, chunk in enumerate(read_csv_with_encoding_detection(f, chunksize=csv_chunk_size)):
+                    for chunk_no, chunk in enumerate(_iter_temp_file_chunks(f, csv_chunk_size)):
                         try:
                             chunk.to_sql(tbl, conn, if_exists="append", index=False, method="multi", chunksize=500)
                         except Exception as ce:
@@ -1090,10 +1152,7 @@ def _import_ods_data(
                             df = cast_and_record(df, fname, sheet, cast_stats, cast_failures, runtime.tax_text_to_zero)
                             df[models.AUDIT_SRC_FILE_COL] = fname
                             df[models.AUDIT_IMPORT_TIME_COL] = process_time
-                            if models.INVOICE_DATE_COL in df.columns:
-                                df[models.INVOICE_YEAR_COL] = df[models.INVOICE_DATE_COL].astype(str).str[:4]
-                            else:
-                                df[models.INVOICE_YEAR_COL] = None
+                            df = add_invoice_year_column(df)
                             df = df.reindex(columns=list(special_columns.get(suffix, [])))
                             target_table = f"ODS_VAT_INV_SPECIAL_{runtime.business_tag}_{suffix}"
                             df.to_sql(target_table, conn, if_exists="append", index=False, method="multi", chunksize=500)
@@ -1106,15 +1165,12 @@ def _import_ods_data(
                             df = cast_and_record(df, fname, sheet, cast_stats, cast_failures, runtime.tax_text_to_zero)
                             df[models.AUDIT_SRC_FILE_COL] = fname
                             df[models.AUDIT_IMPORT_TIME_COL] = process_time
-                            if models.INVOICE_DATE_COL in df.columns:
-                                df[models.INVOICE_YEAR_COL] = df[models.INVOICE_DATE_COL].astype(str).str[:4]
-                            else:
-                                df[models.INVOICE_YEAR_COL] = None
+                            df = add_invoice_year_column(df)
                             df = df.reindex(columns=list(summary_columns))
                             target_table = f"ODS_VAT_INV_DETAIL_FULL_{runtime.business_tag}"
                             df.to_sql(target_table, conn, if_exists="append", index=False, method="multi", chunksize=500)
                             rows = len(df)
-                            key_cols = [c for c in models.INVOICE_KEY_COLS if c in df.columns]
+                            key_cols = select_invoice_key_columns(df)
                             if key_cols:
                                 files_meta[fname]["summary_df"] = df[key_cols].drop_duplicates()
                                 files_meta[fname]["summary_key_cols"] = key_cols
@@ -1126,10 +1182,7 @@ def _import_ods_data(
                             df = cast_and_record(df, fname, sheet, cast_stats, cast_failures, runtime.tax_text_to_zero)
                             df[models.AUDIT_SRC_FILE_COL] = fname
                             df[models.AUDIT_IMPORT_TIME_COL] = process_time
-                            if models.INVOICE_DATE_COL in df.columns:
-                                df[models.INVOICE_YEAR_COL] = df[models.INVOICE_DATE_COL].astype(str).str[:4]
-                            else:
-                                df[models.INVOICE_YEAR_COL] = None
+                            df = add_invoice_year_column(df)
                             strict_detail_columns = [
                                 "detail_uuid","header_uuid","logic_line_no","updated_at","updated_by","import_batch_id","source_system","sync_status","clean_status","fpdm","fphm","sdfphm","invoice_date","hwlwmc","ggxh","dw","sl","dj","je","slv","se","jshj"
                             ]
@@ -1145,10 +1198,7 @@ def _import_ods_data(
                             df = cast_and_record(df, fname, sheet, cast_stats, cast_failures, runtime.tax_text_to_zero)
                             df[models.AUDIT_SRC_FILE_COL] = fname
                             df[models.AUDIT_IMPORT_TIME_COL] = process_time
-                            if models.INVOICE_DATE_COL in df.columns:
-                                df[models.INVOICE_YEAR_COL] = df[models.INVOICE_DATE_COL].astype(str).str[:4]
-                            else:
-                                df[models.INVOICE_YEAR_COL] = None
+                            df = add_invoice_year_column(df)
                             strict_header_columns = [
                                 "header_uuid","source_system","created_at","created_by","updated_at","updated_by","import_batch_id","sync_status","clean_status","detail_total_amount","is_balanced","balance_diff","balance_tolerance","balance_check_time","balance_check_by","balance_notes","related_blue_invoice_uuid","fpdm","fphm","sdfphm","xfsbh","xfmc","gfsbh","gfmc","kprq","invoice_date","invoice_time","je","se","jshj","fply","fppz","fpzt","sfzsfp","fpfxdj","kpr","bz"
                             ]
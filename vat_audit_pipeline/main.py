@@ -82,8 +82,11 @@ def analyze(year: int, config: str) -> None:
             click.echo(msg)
 
 
-def main() -> None:
-    VATAuditPipeline().run()
+def main(overrides: dict | None = None, verbose: bool = False) -> None:
+    """运行流水线；overrides 为可选的配置覆盖项（结构同 config.yaml），如 GUI 传入的目录、业务标签与并行设置；
+    verbose 同 CLI 的 --verbose，启用 DEBUG 日志。"""
+
+    VATAuditPipeline(overrides=overrides, verbose=verbose).run()
 
 
 if __name__ == "__main__":
@@ -25,6 +25,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -58,6 +60,11 @@ class QueryResult:
             return dict(zip(self.columns, self.rows[0]))
         return None
 
+    def to_frame(self) -> pd.DataFrame:
+        """将查询结果按列构建为 DataFrame，跳过中间的字典列表。"""
+
+        return pd.DataFrame.from_records(self.rows, columns=self.columns)
+
     def is_success(self) -> bool:
         """检查查询是否成功。"""
 
@@ -102,6 +109,7 @@ class DatabaseConnection:
         self.timeout = timeout
         self.isolation_level = isolation_level
         self._conn: Optional[sqlite3.Connection] = None
+        self._default_cursor: Optional[sqlite3.Cursor] = None
         self._in_transaction = False
 
     def connect(self) -> sqlite3.Connection:
@@ -131,10 +139,19 @@ class DatabaseConnection:
                     self._conn.rollback()
                 self._conn.close()
                 self._conn = None
+                self._default_cursor = None
                 logger.debug(f"✓ 已关闭数据库连接: {self.database_path}")
             except Exception as e:
                 logger.error(f"关闭数据库连接时出错: {e}")
 
+    def _get_cursor(self) -> sqlite3.Cursor:
+        """返回连接级复用游标，避免每次查询都构造新的 Cursor 对象。"""
+
+        conn = self.connect()
+        if self._default_cursor is None:
+            self._default_cursor = conn.cursor()
+        return self._default_cursor
+
     def __enter__(self):
         """上下文管理器入口。"""
 
@@ -176,6 +193,45 @@ class DatabaseConnection:
             logger.error(f"事务已回滚，原因: {e}")
             raise DatabaseQueryError(f"事务执行失败: {e}") from e
 
+    @contextmanager
+    def bulk_load_mode(self):
+        """
+        上下文管理器：批量装载期间关闭日志落盘与 fsync，结束后恢复原 PRAGMA。
+
+        journal_mode=MEMORY + synchronous=OFF + locking_mode=EXCLUSIVE 可显著加速大批量写入，
+        但进程崩溃可能损坏数据库，仅适用于可重建的暂存数据（如 ODS 层）。需在事务外进入。
+
+        使用示例：
+            with db.bulk_load_mode(), db.transaction():
+                dao.insert(columns, rows)
+        """
+
+        conn = self.connect()
+        saved = {
+            name: conn.execute(f"PRAGMA {name}").fetchone()[0]
+            for name in ("journal_mode", "synchronous", "locking_mode")
+        }
+        conn.execute("PRAGMA journal_mode=MEMORY")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA locking_mode=EXCLUSIVE")
+        logger.debug(f"✓ 已进入批量装载模式，原设置: {saved}")
+        try:
+            yield
+        finally:
+            try:
+                # 装载后刷新 sqlite_stat1，供 count_estimate 和查询规划使用；analysis_limit 限制采样行数
+                conn.execute("PRAGMA analysis_limit=1000")
+                conn.execute("ANALYZE")
+            except sqlite3.Error as e:
+                logger.warning(f"刷新统计信息失败: {e}")
+            try:
+                conn.execute(f"PRAGMA locking_mode={saved['locking_mode']}")
+                conn.execute(f"PRAGMA journal_mode={saved['journal_mode']}")
+                conn.execute(f"PRAGMA synchronous={saved['synchronous']}")
+                logger.debug("✓ 已恢复批量装载前的 PRAGMA 设置")
+            except sqlite3.Error as e:
+                logger.warning(f"恢复 PRAGMA 设置失败: {e}")
+
     def pragma_optimize(self, mode: str = "wal"):
         """
         应用性能优化 PRAGMA。
@@ -184,8 +240,7 @@ class DatabaseConnection:
             mode: 'wal' (WAL 模式) 或 'default' (日志模式)
         """
 
-        conn = self.connect()
-        cursor = conn.cursor()
+        cursor = self._get_cursor()
         try:
             if mode == "wal":
                 cursor.execute("PRAGMA journal_mode=WAL")
@@ -221,8 +276,7 @@ class DatabaseConnection:
         if not isinstance(params, (tuple, list)):
             params = (params,)
 
-        conn = self.connect()
-        cursor = conn.cursor()
+        cursor = self._get_cursor()
         start_time = datetime.now()
         try:
             cursor.execute(query, params)
@@ -241,6 +295,31 @@ class DatabaseConnection:
             logger.error(f"查询失败: {query[:60]}... 错误: {e}")
             return QueryResult(rows=[], columns=[], error=str(e), execution_time_ms=execution_time)
 
+    def read_frame(self, query: str, params: Tuple = ()) -> pd.DataFrame:
+        """
+        执行 SELECT 查询并直接返回 DataFrame（参数化）。
+
+        下游需要 DataFrame 时使用：pandas 直接从游标按列构建，不经过 QueryResult 行列表。
+        执行出错时记录日志并返回空 DataFrame。
+        """
+
+        if not self._is_select_statement(query):
+            raise SQLInjectionError(f"查询必须是 SELECT 语句: {query[:50]}...")
+
+        if not isinstance(params, (tuple, list)):
+            params = (params,)
+
+        conn = self.connect()
+        start_time = datetime.now()
+        try:
+            df = pd.read_sql_query(query, conn, params=params)
+            execution_time = (datetime.now() - start_time).total_seconds() * 1000
+            logger.debug(f"查询成功: {query[:60]}... ({len(df)} 行, {execution_time:.2f}ms)")
+            return df
+        except (sqlite3.Error, pd.errors.DatabaseError) as e:
+            logger.error(f"查询失败: {query[:60]}... 错误: {e}")
+            return pd.DataFrame()
+
     def execute_insert(self, query: str, params: Tuple = ()) -> QueryResult:
         """执行 INSERT 查询（参数化）。"""
 
@@ -256,6 +335,22 @@ class DatabaseConnection:
 
         return self._execute_modify(query, params, "DELETE")
 
+    def execute_many(self, query: str, seq_of_params: List[Tuple]) -> QueryResult:
+        """执行批量 INSERT/UPDATE（参数化，单次 executemany 往返）。"""
+
+        cursor = self._get_cursor()
+        start_time = datetime.now()
+        try:
+            cursor.executemany(query, seq_of_params)
+            rowcount = cursor.rowcount
+            execution_time = (datetime.now() - start_time).total_seconds() * 1000
+            logger.debug(f"批量执行成功: 受影响 {rowcount} 行 ({execution_time:.2f}ms)")
+            return QueryResult(rows=[], columns=[], rowcount=rowcount, execution_time_ms=execution_time)
+        except sqlite3.Error as e:
+            execution_time = (datetime.now() - start_time).total_seconds() * 1000
+            logger.error(f"批量执行失败: {query[:60]}... 错误: {e}")
+            return QueryResult(rows=[], columns=[], error=str(e), execution_time_ms=execution_time)
+
     def execute_pragma(self, pragma: str) -> QueryResult:
         """
         执行 PRAGMA 命令（不参数化，仅用于系统命令）。
@@ -263,8 +358,7 @@ class DatabaseConnection:
         注意：PRAGMA 不支持参数化，仅用于内部优化，不处理用户输入。
         """
 
-        conn = self.connect()
-        cursor = conn.cursor()
+        cursor = self._get_cursor()
         start_time = datetime.now()
         try:
             cursor.execute(pragma)
@@ -277,6 +371,29 @@ class DatabaseConnection:
             logger.error(f"PRAGMA 执行失败: {pragma[:50]}... 错误: {e}")
             return QueryResult(rows=[], columns=[], error=str(e))
 
+    def execute_ddl(self, sql: str) -> QueryResult:
+        """
+        执行 DDL 语句（CREATE INDEX / DROP TABLE 等，不参数化）并立即提交。
+
+        注意：与 execute_pragma 分开，确保非自动提交模式下 DDL 也会落盘；
+        处于 transaction() 内时不提交，由事务统一 COMMIT/ROLLBACK。
+        """
+
+        conn = self.connect()
+        cursor = self._get_cursor()
+        start_time = datetime.now()
+        try:
+            cursor.execute(sql)
+            if not self._in_transaction:
+                conn.commit()
+            execution_time = (datetime.now() - start_time).total_seconds() * 1000
+            logger.debug(f"DDL 执行成功: {sql[:60]}... ({execution_time:.2f}ms)")
+            return QueryResult(rows=[], columns=[], rowcount=cursor.rowcount, execution_time_ms=execution_time)
+        except sqlite3.Error as e:
+            execution_time = (datetime.now() - start_time).total_seconds() * 1000
+            logger.error(f"DDL 执行失败: {sql[:60]}... 错误: {e}")
+            return QueryResult(rows=[], columns=[], error=str(e), execution_time_ms=execution_time)
+
     def execute_script(self, script: str) -> QueryResult:
         """
         执行多条 SQL 语句（脚本模式，不支持参数化）。
@@ -285,6 +402,7 @@ class DatabaseConnection:
         """
 
         conn = self.connect()
+        # executescript 会先隐式 COMMIT 并改写游标状态，使用独立游标避免影响复用游标
         cursor = conn.cursor()
         start_time = datetime.now()
         try:
@@ -304,8 +422,7 @@ class DatabaseConnection:
         if not isinstance(params, (tuple, list)):
             params = (params,)
 
-        conn = self.connect()
-        cursor = conn.cursor()
+        cursor = self._get_cursor()
         start_time = datetime.now()
         try:
             cursor.execute(query, params)
@@ -337,6 +454,14 @@ class DAOBase:
         self.db = db
         self.table_name = table_name
 
+    def _ensure_indexes(self, indexes: Dict[str, List[str]]) -> None:
+        """表已存在时补建索引（CREATE INDEX IF NOT EXISTS，可重复调用）。"""
+
+        if not self.table_exists():
+            return
+        for index_name, columns in indexes.items():
+            self.create_index(index_name, columns)
+
     def table_exists(self) -> bool:
         """检查表是否存在。"""
 
@@ -355,6 +480,24 @@ class DAOBase:
             return result.rows[0][0]
         return -1
 
+    def count_estimate(self) -> int:
+        """
+        读取 ANALYZE 生成的 sqlite_stat1 行数估计（常数时间，不扫表）。
+
+        仅适用于不要求精确值的场景（进度提示、容量估算）；没有统计信息时回退到精确 count()。
+        """
+
+        stat_table = self.db.execute_select(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='sqlite_stat1'"
+        )
+        if stat_table.is_success() and stat_table.rows:
+            result = self.db.execute_select("SELECT stat FROM sqlite_stat1 WHERE tbl=? LIMIT 1", (self.table_name,))
+            if result.is_success() and result.rows and result.rows[0][0]:
+                first_token = str(result.rows[0][0]).split(" ", 1)[0]
+                if first_token.isdigit():
+                    return int(first_token)
+        return self.count()
+
     def find_all(self, order_by: str = "", limit: int = 0) -> List[Dict[str, Any]]:
         """查询表中所有记录。"""
 
@@ -366,6 +509,16 @@ class DAOBase:
         result = self.db.execute_select(query)
         return result.to_dict_list() if result.is_success() else []
 
+    def find_all_frame(self, order_by: str = "", limit: int = 0) -> pd.DataFrame:
+        """查询表中所有记录并直接返回 DataFrame。"""
+
+        query = f"SELECT * FROM {self.table_name}"
+        if order_by:
+            query += f" ORDER BY {order_by}"
+        if limit > 0:
+            query += f" LIMIT {limit}"
+        return self.db.read_frame(query)
+
     def find_by_id(self, id_value: Any, id_column: str = "id") -> Optional[Dict[str, Any]]:
         """按 ID 查询单条记录。"""
 
@@ -373,6 +526,31 @@ class DAOBase:
         result = self.db.execute_select(query, (id_value,))
         return result.to_first_dict() if result.is_success() else None
 
+    def find_by_invoices(self, pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        批量按 (发票代码, 发票号码) 查询，替代逐条 find_by_invoice。
+
+        键写入连接级临时表后与目标表 JOIN，一次查询取回全部匹配；
+        同一发票有多行时保留首个匹配行，与 find_by_invoice 的 LIMIT 1 语义一致。
+        """
+
+        keys = list(dict.fromkeys(pairs))
+        if not keys:
+            return {}
+        self.db.execute_ddl("CREATE TEMP TABLE IF NOT EXISTS invoice_lookup (发票代码 TEXT, 发票号码 TEXT)")
+        self.db.execute_delete("DELETE FROM temp.invoice_lookup")
+        self.db.execute_many("INSERT INTO temp.invoice_lookup (发票代码, 发票号码) VALUES (?, ?)", keys)
+        query = (
+            f"SELECT t.* FROM {self.table_name} t "
+            "JOIN temp.invoice_lookup i ON t.发票代码 = i.发票代码 AND t.发票号码 = i.发票号码"
+        )
+        result = self.db.execute_select(query)
+        found: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        if result.is_success():
+            for record in result.to_dict_list():
+                found.setdefault((record["发票代码"], record["发票号码"]), record)
+        return found
+
     def find_where(
         self,
         where_clause: str,
@@ -391,17 +569,44 @@ class DAOBase:
         return result.to_dict_list() if result.is_success() else []
 
     def insert(self, columns: List[str], values: List[Tuple]) -> QueryResult:
-        """批量插入记录。"""
+        """
+        批量插入记录。
+
+        整批先在保存点内用一次 executemany 插入；任一行失败（如违反约束）时回滚整批，
+        再逐行重试：失败的行记录警告后跳过，其余行照常写入。
+        返回结果的 rowcount 为实际写入行数；有行失败时 error 为首个失败行的错误。
+        """
 
         placeholders = ",".join(["?" for _ in columns])
         query = f"INSERT INTO {self.table_name} ({','.join(columns)}) VALUES ({placeholders})"
-        results = []
-        for value_tuple in values:
-            result = self.db.execute_insert(query, value_tuple)
-            results.append(result)
-            if not result.is_success():
-                logger.warning(f"插入失败: {result.error}")
-        return results[0] if results else QueryResult(rows=[], columns=[])
+        if not values:
+            return QueryResult(rows=[], columns=[])
+
+        # 保存点既可嵌套在外层事务中，也可在自动提交模式下单独成事务，保证整批回滚后重试不会重复写入
+        conn = self.db.connect()
+        conn.execute("SAVEPOINT dao_insert")
+        try:
+            result = self.db.execute_many(query, values)
+            if result.is_success():
+                return result
+            conn.execute("ROLLBACK TO dao_insert")
+            logger.warning(f"批量插入失败，改为逐行插入: {result.error}")
+
+            inserted = 0
+            first_error: Optional[str] = None
+            for value_tuple in values:
+                row_result = self.db.execute_insert(query, value_tuple)
+                if row_result.is_success():
+                    inserted += row_result.rowcount
+                else:
+                    logger.warning(f"插入失败: {row_result.error}")
+                    first_error = first_error or row_result.error
+            return QueryResult(rows=[], columns=[], rowcount=inserted, error=first_error)
+        except BaseException:
+            conn.execute("ROLLBACK TO dao_insert")
+            raise
+        finally:
+            conn.execute("RELEASE dao_insert")
 
     def delete_where(self, where_clause: str, params: Tuple = ()) -> QueryResult:
         """按条件删除记录。"""
@@ -417,19 +622,19 @@ class DAOBase:
             f"CREATE {unique_str} INDEX IF NOT EXISTS {index_name} "
             f"ON {self.table_name} ({','.join(columns)})"
         )
-        return self.db.execute_pragma(query)
+        return self.db.execute_ddl(query)
 
     def drop_table(self) -> QueryResult:
         """删除表。"""
 
         query = f"DROP TABLE IF EXISTS {self.table_name}"
-        return self.db.execute_pragma(query)
+        return self.db.execute_ddl(query)
 
     def truncate(self) -> QueryResult:
         """清空表（删除所有行）。"""
 
         query = f"DELETE FROM {self.table_name}"
-        return self.db.execute_delete(query)
+        return self.db.execute_ddl(query)
 
 
 class ODSDetailDAO(DAOBase):
@@ -438,6 +643,13 @@ class ODSDetailDAO(DAOBase):
     def __init__(self, db: DatabaseConnection, business_tag: str):
         super().__init__(db, f"ODS_{business_tag}_DETAIL")
         self.business_tag = business_tag
+        # 年份索引让 get_distinct_years 走索引扫描免排序；发票键索引服务 find_by_invoice 等值查找
+        self._ensure_indexes(
+            {
+                f"IDX_{self.table_name}_YEAR": ["开票年份"],
+                f"IDX_{self.table_name}_INVOICE": ["发票代码", "发票号码"],
+            }
+        )
 
     def find_by_invoice(self, invoice_code: str, invoice_number: str) -> Optional[Dict[str, Any]]:
         query = f"SELECT * FROM {self.table_name} WHERE 发票代码=? AND 发票号码=? LIMIT 1"
@@ -451,8 +663,8 @@ class ODSDetailDAO(DAOBase):
 
     def get_distinct_years(self) -> List[str]:
         query = (
-            f"SELECT DISTINCT 开票年份 as y FROM {self.table_name} "
-            "WHERE 开票年份 IS NOT NULL ORDER BY y"
+            f"SELECT 开票年份 FROM {self.table_name} "
+            "WHERE 开票年份 IS NOT NULL GROUP BY 开票年份 ORDER BY 开票年份"
         )
         result = self.db.execute_select(query)
         if result.is_success():
@@ -469,6 +681,13 @@ class ODSHeaderDAO(DAOBase):
     def __init__(self, db: DatabaseConnection, business_tag: str):
         super().__init__(db, f"ODS_{business_tag}_HEADER")
         self.business_tag = business_tag
+        # 年份索引让 get_distinct_years 走索引扫描免排序；发票键索引服务 find_by_invoice 等值查找
+        self._ensure_indexes(
+            {
+                f"IDX_{self.table_name}_YEAR": ["开票年份"],
+                f"IDX_{self.table_name}_INVOICE": ["发票代码", "发票号码"],
+            }
+        )
 
     def find_by_invoice(self, invoice_code: str, invoice_number: str) -> Optional[Dict[str, Any]]:
         query = f"SELECT * FROM {self.table_name} WHERE 发票代码=? AND 发票号码=? LIMIT 1"
@@ -482,8 +701,8 @@ class ODSHeaderDAO(DAOBase):
 
     def get_distinct_years(self) -> List[str]:
         query = (
-            f"SELECT DISTINCT 开票年份 as y FROM {self.table_name} "
-            "WHERE 开票年份 IS NOT NULL ORDER BY y"
+            f"SELECT 开票年份 FROM {self.table_name} "
+            "WHERE 开票年份 IS NOT NULL GROUP BY 开票年份 ORDER BY 开票年份"
         )
         result = self.db.execute_select(query)
         if result.is_success():
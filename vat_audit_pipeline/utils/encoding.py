@@ -9,14 +9,24 @@ Important: to keep backward compatibility with existing code/tests,
 
 from __future__ import annotations
 
+import codecs
+import importlib.util
 import logging
 import os
+from functools import lru_cache
 from typing import Optional
 
 import pandas as pd
 
 logger = logging.getLogger("vat_audit")
 
+ALTERNATIVE_ENCODINGS = ("gbk", "utf-8", "utf-8-sig", "gb2312", "cp936")
+# pyarrow 引擎一次性解析整个文件，不支持分块/截断类参数，显式请求 pyarrow 时遇到这些参数仍走 C 引擎
+_PYARROW_UNSUPPORTED_KWARGS = frozenset(
+	{"chunksize", "iterator", "nrows", "skipfooter", "low_memory", "memory_map", "float_precision", "converters"}
+)
+_PROBE_BLOCK_SIZE = 8 << 20
+
 
 def detect_encoding(file_path: str, sample_size: int = 10000) -> str:
 	"""Detect file encoding using chardet with simple alias normalization."""
@@ -57,6 +67,51 @@ def detect_encoding(file_path: str, sample_size: int = 10000) -> str:
 		return "utf-8-sig"
 
 
+@lru_cache(maxsize=1)
+def _pyarrow_available() -> bool:
+	return importlib.util.find_spec("pyarrow") is not None
+
+
+def _read_csv(file_path: str, encoding: str, **kwargs) -> pd.DataFrame:
+	"""默认使用 pandas C 引擎；仅当调用方显式传入 engine="pyarrow" 时使用 pyarrow 多线程解析器。
+
+	pyarrow 引擎会先做类型推断且无法关闭：日期列返回 datetime.date / datetime64，
+	指定 dtype=str 时空值变为字符串 "None"，与 C 引擎保留原文本的结果不一致，因此不作为默认。
+	显式请求 pyarrow 但参数不兼容、未安装或解析失败时回退 C 引擎。
+	"""
+
+	if kwargs.get("engine") == "pyarrow":
+		kwargs = dict(kwargs)
+		del kwargs["engine"]
+		if _pyarrow_available() and not (_PYARROW_UNSUPPORTED_KWARGS & kwargs.keys()):
+			try:
+				return pd.read_csv(file_path, encoding=encoding, engine="pyarrow", **kwargs)
+			except UnicodeDecodeError:
+				raise
+			except Exception as e:
+				logger.debug(f"pyarrow 引擎读取失败，回退 C 引擎: {os.path.basename(file_path)}: {e}")
+	return pd.read_csv(file_path, encoding=encoding, **kwargs)
+
+
+def _probe_alternative_encoding(file_path: str, failed_encoding: str) -> Optional[str]:
+	"""逐块解码原始字节寻找可用的备选编码，避免每个候选编码都完整解析一遍 CSV。"""
+
+	for alt_enc in ALTERNATIVE_ENCODINGS:
+		if alt_enc == failed_encoding:
+			continue
+		decoder = codecs.getincrementaldecoder(alt_enc)()
+		try:
+			with open(file_path, "rb") as f:
+				while block := f.read(_PROBE_BLOCK_SIZE):
+					decoder.decode(block)
+			decoder.decode(b"", final=True)
+			return alt_enc
+		except UnicodeDecodeError:
+			logger.debug(f"备选编码不匹配: {alt_enc}")
+			continue
+	return None
+
+
 def read_csv_with_encoding_detection(
 	file_path: str,
 	encoding: Optional[str] = None,
@@ -67,24 +122,19 @@ def read_csv_with_encoding_detection(
 	if encoding is None:
 		encoding = detect_encoding(file_path)
 	try:
-		return pd.read_csv(file_path, encoding=encoding, **kwargs)
+		return _read_csv(file_path, encoding, **kwargs)
 	except UnicodeDecodeError as e:
 		logger.warning(f"使用 {encoding} 读取失败: {e}，尝试备选编码...")
-		alternative_encodings = ["gbk", "utf-8", "utf-8-sig", "gb2312", "cp936"]
-		for alt_enc in alternative_encodings:
-			if alt_enc == encoding:
-				continue
+		alt_enc = _probe_alternative_encoding(file_path, encoding)
+		if alt_enc is not None:
 			try:
-				logger.debug(f"尝试备选编码: {alt_enc}")
-				df = pd.read_csv(file_path, encoding=alt_enc, **kwargs)
+				df = _read_csv(file_path, alt_enc, **kwargs)
 				logger.info(f"使用备选编码 {alt_enc} 成功读取: {os.path.basename(file_path)}")
 				return df
-			except UnicodeDecodeError:
-				continue
-			except Exception:
-				continue
+			except Exception as alt_e:
+				logger.debug(f"备选编码 {alt_enc} 解析失败: {alt_e}")
 		logger.error(f"所有编码都失败，使用 errors='replace' 跳过无法解码的字符: {file_path}")
-		return pd.read_csv(file_path, encoding=encoding, errors="replace", **kwargs)
+		return pd.read_csv(file_path, encoding=encoding, encoding_errors="replace", **kwargs)
 	except Exception as e:
 		logger.error(f"读取 CSV 失败 {file_path}: {e}")
 		raise
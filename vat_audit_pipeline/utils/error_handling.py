@@ -14,22 +14,25 @@
 """
 
 import logging
+import re
+import sqlite3
+import time
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
-from enum import Enum
-from typing import Any, Dict, List, Optional
+from enum import Enum, IntEnum
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 logger = logging.getLogger(__name__)
 
 
-class ErrorLevel(Enum):
-    """错误严重级别"""
+class ErrorLevel(IntEnum):
+    """错误严重级别（整数值越大越严重，可直接比较阈值；对外输出使用 name）"""
 
-    CRITICAL = "CRITICAL"  # 严重，流程无法继续
-    ERROR = "ERROR"  # 错误，某个操作失败
-    WARNING = "WARNING"  # 警告，异常但可继续
-    INFO = "INFO"  # 信息，记录用途
+    CRITICAL = 3  # 严重，流程无法继续
+    ERROR = 2  # 错误，某个操作失败
+    WARNING = 1  # 警告，异常但可继续
+    INFO = 0  # 信息，记录用途
 
 
 class ErrorCategory(Enum):
@@ -66,6 +69,7 @@ class VATAuditException(Exception):
         message: 错误信息
         context: 错误上下文（如文件名、行号等）
         original_error: 原始异常对象
+        timestamp: 创建时间（按需由纳秒时间戳换算为 datetime）
     """
 
     def __init__(
@@ -79,27 +83,56 @@ class VATAuditException(Exception):
         self.message = message
         self.category = category
         self.level = level
+        # 输出时频繁读取的枚举值/名称在构造时缓存为普通字符串，避开枚举描述符的属性分发
+        self._category_value = category.value
+        self._level_name = level.name
         self.context = context or {}
         self.original_error = original_error
-        self.timestamp = datetime.now()
+        # 创建时间只记录纳秒时间戳，datetime 推迟到读取 timestamp 时再构造
+        self._timestamp_ns = time.time_ns()
         super().__init__(self.message)
 
+    def __reduce__(self):
+        # 按属性重建而不重新调用 __init__：子类构造参数与 args 不一致（如 FileReadError 需要 file_path、
+        # 消息带前缀），默认的 cls(*args) 会失败或重复拼接前缀；跨 multiprocessing 边界时依赖此处
+        return (_rebuild_exception, (type(self), self.args, self.__dict__))
+
+    @property
+    def timestamp(self) -> datetime:
+        """异常创建时间。"""
+
+        return datetime.fromtimestamp(self._timestamp_ns / 1e9)
+
     def __str__(self) -> str:
-        return f"[{self.category.value}] {self.message}"
+        return f"[{self._category_value}] {self.message}"
+
+    def report_context(self) -> Dict[str, Any]:
+        """输出（日志/报告/序列化）用的上下文，子类可在此裁剪大字段。"""
+
+        return self.context
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式，便于序列化和报告"""
 
         return {
             "timestamp": self.timestamp.isoformat(),
-            "category": self.category.value,
-            "level": self.level.value,
+            "category": self._category_value,
+            "level": self._level_name,
             "message": self.message,
-            "context": self.context,
+            "context": self.report_context(),
             "original_error": str(self.original_error) if self.original_error else None,
         }
 
 
+def _rebuild_exception(cls, args, state):
+    """反序列化 VATAuditException：恢复 args 与实例属性，不经过 __init__。"""
+
+    exc = cls.__new__(cls, *args)
+    exc.args = args
+    exc.__dict__.update(state)
+    return exc
+
+
 # ============================================================================
 # 文件相关异常
 # ============================================================================
@@ -176,12 +209,21 @@ class PermissionError_(FileError):
 class DatabaseError(VATAuditException):
     """数据库相关错误的基类"""
 
+    # 输出时只保留 SQL 前 100 字符；构造时仅保存引用，避免批量失败时逐个切片分配
+    QUERY_PREVIEW_CHARS = 100
+
     def __init__(self, message: str, query: Optional[str] = None, **kwargs):
         context = kwargs.pop("context", {})
         if query:
-            context["query"] = query[:100]  # 只保存前 100 字符
+            context["query"] = query
         super().__init__(message, context=context, **kwargs)
 
+    def report_context(self) -> Dict[str, Any]:
+        query = self.context.get("query")
+        if query is None or len(query) <= self.QUERY_PREVIEW_CHARS:
+            return self.context
+        return {**self.context, "query": query[: self.QUERY_PREVIEW_CHARS]}
+
 
 class DatabaseConnectionError(DatabaseError):
     """数据库连接错误"""
@@ -364,18 +406,19 @@ class ErrorStatistics:
     """错误统计信息"""
 
     total: int = 0
-    by_category: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
-    by_level: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    by_category: Dict[str, int] = field(default_factory=dict)
+    by_level: Dict[str, int] = field(default_factory=dict)
     critical_count: int = 0
     error_count: int = 0
     warning_count: int = 0
     info_count: int = 0
 
     def to_dict(self) -> Dict[str, Any]:
+        # by_category/by_level 由 get_statistics 一次性构建为普通 dict，直接返回不再复制
         return {
             "total": self.total,
-            "by_category": dict(self.by_category),
-            "by_level": dict(self.by_level),
+            "by_category": self.by_category,
+            "by_level": self.by_level,
             "critical": self.critical_count,
             "error": self.error_count,
             "warning": self.warning_count,
@@ -409,6 +452,8 @@ class ErrorCollector:
             logger.critical(report)
     """
 
+    _LOG_DISPATCH: Optional[Dict[ErrorLevel, Callable[[str], None]]] = None
+
     def __init__(self, auto_log: bool = True):
         """
         初始化错误收集器。
@@ -420,6 +465,13 @@ class ErrorCollector:
         self.errors: List[VATAuditException] = []
         self.auto_log = auto_log
         self.start_time = datetime.now()
+        # 时长用单调时钟计算，start_time 仅保留用于输出可读的开始时间
+        self._t0 = time.perf_counter()
+        # collect() 时增量维护计数和分类索引，查询/统计无需重复扫描 self.errors
+        self._by_level: Dict[ErrorLevel, int] = defaultdict(int)
+        self._by_cat: Dict[ErrorCategory, int] = defaultdict(int)
+        self._cat_index: Dict[ErrorCategory, List[int]] = defaultdict(list)
+        self._level_index: Dict[ErrorLevel, List[int]] = defaultdict(list)
 
     def collect(self, error: VATAuditException) -> None:
         """
@@ -432,7 +484,12 @@ class ErrorCollector:
         if not isinstance(error, VATAuditException):
             raise TypeError(f"Expected VATAuditException, got {type(error)}")
 
+        index = len(self.errors)
         self.errors.append(error)
+        self._by_level[error.level] += 1
+        self._by_cat[error.category] += 1
+        self._cat_index[error.category].append(index)
+        self._level_index[error.level].append(index)
 
         if self.auto_log:
             self._log_error(error)
@@ -460,17 +517,25 @@ class ErrorCollector:
         error = VATAuditException(msg, category, level, context, exception)
         self.collect(error)
 
+    @classmethod
+    def _log_dispatch(cls) -> Dict[ErrorLevel, Callable[[str], None]]:
+        """级别到日志函数的映射，首次使用时构建一次（避免每条错误重建字典）"""
+
+        if cls._LOG_DISPATCH is None:
+            cls._LOG_DISPATCH = {
+                ErrorLevel.CRITICAL: logger.critical,
+                ErrorLevel.ERROR: logger.error,
+                ErrorLevel.WARNING: logger.warning,
+                ErrorLevel.INFO: logger.info,
+            }
+        return cls._LOG_DISPATCH
+
     def _log_error(self, error: VATAuditException) -> None:
         """内部方法：将错误记录到日志"""
 
-        log_func = {
-            ErrorLevel.CRITICAL: logger.critical,
-            ErrorLevel.ERROR: logger.error,
-            ErrorLevel.WARNING: logger.warning,
-            ErrorLevel.INFO: logger.info,
-        }.get(error.level, logger.error)
+        log_func = self._log_dispatch().get(error.level, logger.error)
 
-        context_str = f" | Context: {error.context}" if error.context else ""
+        context_str = f" | Context: {error.report_context()}" if error.context else ""
         log_func(f"{error}{context_str}")
 
     def has_errors(self) -> bool:
@@ -481,27 +546,32 @@ class ErrorCollector:
     def has_critical(self) -> bool:
         """是否有严重错误"""
 
-        return any(e.level == ErrorLevel.CRITICAL for e in self.errors)
+        return self._by_level[ErrorLevel.CRITICAL] > 0
 
     def has_errors_of_level(self, level: ErrorLevel) -> bool:
         """是否有指定级别的错误"""
 
-        return any(e.level == level for e in self.errors)
+        return self._by_level[level] > 0
+
+    def has_errors_at_least(self, level: ErrorLevel) -> bool:
+        """是否有不低于指定级别的错误（如 ERROR 同时包含 CRITICAL）"""
+
+        return any(count for lvl, count in self._by_level.items() if lvl >= level)
 
     def has_errors_of_category(self, category: ErrorCategory) -> bool:
         """是否有指定分类的错误"""
 
-        return any(e.category == category for e in self.errors)
+        return self._by_cat[category] > 0
 
     def get_errors_by_category(self, category: ErrorCategory) -> List[VATAuditException]:
         """获取指定分类的所有错误"""
 
-        return [e for e in self.errors if e.category == category]
+        return [self.errors[i] for i in self._cat_index[category]]
 
     def get_errors_by_level(self, level: ErrorLevel) -> List[VATAuditException]:
         """获取指定级别的所有错误"""
 
-        return [e for e in self.errors if e.level == level]
+        return [self.errors[i] for i in self._level_index[level]]
 
     def get_statistics(self) -> ErrorStatistics:
         """获取错误统计信息"""
@@ -509,18 +579,13 @@ class ErrorCollector:
         stats = ErrorStatistics()
         stats.total = len(self.errors)
 
-        for error in self.errors:
-            stats.by_category[error.category.value] += 1
-            stats.by_level[error.level.value] += 1
+        stats.by_category = {category.value: count for category, count in self._by_cat.items() if count}
+        stats.by_level = {level.name: count for level, count in self._by_level.items() if count}
 
-            if error.level == ErrorLevel.CRITICAL:
-                stats.critical_count += 1
-            elif error.level == ErrorLevel.ERROR:
-                stats.error_count += 1
-            elif error.level == ErrorLevel.WARNING:
-                stats.warning_count += 1
-            elif error.level == ErrorLevel.INFO:
-                stats.info_count += 1
+        stats.critical_count = self._by_level[ErrorLevel.CRITICAL]
+        stats.error_count = self._by_level[ErrorLevel.ERROR]
+        stats.warning_count = self._by_level[ErrorLevel.WARNING]
+        stats.info_count = self._by_level[ErrorLevel.INFO]
 
         return stats
 
@@ -535,53 +600,51 @@ class ErrorCollector:
             格式化的错误报告字符串
         """
 
+        return "\n".join(self._iter_report_lines(detailed))
+
+    def _iter_report_lines(self, detailed: bool = True) -> Iterator[str]:
+        """逐段生成报告内容（以换行连接即为完整报告），导出文件时无需在内存中拼出整份报告。"""
+
         if not self.has_errors():
-            return "✓ 未发现错误"
+            yield "✓ 未发现错误"
+            return
 
-        lines: List[str] = []
-        lines.append("\n" + "=" * 80)
-        lines.append("错误收集报告")
-        lines.append("=" * 80)
+        yield "\n" + "=" * 80
+        yield "错误收集报告"
+        yield "=" * 80
 
         # 统计信息
         stats = self.get_statistics()
-        lines.append("\n📊 统计信息：")
-        lines.append(f"  总错误数：{stats.total}")
-        lines.append(f"  严重错误：{stats.critical_count}")
-        lines.append(f"  一般错误：{stats.error_count}")
-        lines.append(f"  警告：{stats.warning_count}")
-        lines.append(f"  信息：{stats.info_count}")
-
-        # 按分类分组显示
-        errors_by_cat: Dict[ErrorCategory, List[VATAuditException]] = defaultdict(list)
-        for error in self.errors:
-            errors_by_cat[error.category].append(error)
-
-        lines.append("\n📂 按分类统计：")
-        for category, errors in sorted(errors_by_cat.items()):
-            lines.append(f"  {category.value}: {len(errors)} 个")
+        yield "\n📊 统计信息："
+        yield f"  总错误数：{stats.total}"
+        yield f"  严重错误：{stats.critical_count}"
+        yield f"  一般错误：{stats.error_count}"
+        yield f"  警告：{stats.warning_count}"
+        yield f"  信息：{stats.info_count}"
+
+        # 按分类统计直接复用 stats.by_category（已按分类值汇总且不含零计数），无需再分组
+        yield "\n📂 按分类统计："
+        for category_value, count in sorted(stats.by_category.items()):
+            yield f"  {category_value}: {count} 个"
 
         if detailed:
-            # 详细错误列表
-            lines.append("\n📝 详细错误列表：")
-            lines.append("-" * 80)
+            # 详细错误列表：每个错误拼成一个块输出，减少中间字符串和属性查找
+            yield "\n📝 详细错误列表："
+            yield "-" * 80
 
             for i, error in enumerate(self.errors, start=1):
-                lines.append(f"\n{i}. [{error.level.value}] {error.category.value}")
-                lines.append(f"   消息：{error.message}")
+                block = [f"\n{i}. [{error._level_name}] {error._category_value}\n   消息：{error.message}"]
 
                 if error.context:
-                    lines.append("   上下文：")
-                    for key, value in error.context.items():
-                        lines.append(f"     - {key}: {value}")
+                    block.append("\n   上下文：\n")
+                    block.append("\n".join([f"     - {key}: {value}" for key, value in error.report_context().items()]))
 
-                if error.original_error:
-                    lines.append(
-                        f"   原始异常：{type(error.original_error).__name__}: {error.original_error}"
-                    )
+                original_error = error.original_error
+                if original_error:
+                    block.append(f"\n   原始异常：{type(original_error).__name__}: {original_error}")
+                yield "".join(block)
 
-        lines.append("\n" + "=" * 80)
-        return "\n".join(lines)
+        yield "\n" + "=" * 80
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式，便于序列化"""
@@ -590,13 +653,17 @@ class ErrorCollector:
             "errors": [e.to_dict() for e in self.errors],
             "statistics": self.get_statistics().to_dict(),
             "start_time": self.start_time.isoformat(),
-            "duration_seconds": (datetime.now() - self.start_time).total_seconds(),
+            "duration_seconds": time.perf_counter() - self._t0,
         }
 
     def clear(self) -> None:
         """清空所有错误（用于重新开始）"""
 
         self.errors.clear()
+        self._by_level.clear()
+        self._by_cat.clear()
+        self._cat_index.clear()
+        self._level_index.clear()
 
     def export_to_file(self, file_path: str, detailed: bool = True) -> None:
         """
@@ -608,9 +675,13 @@ class ErrorCollector:
         """
 
         try:
-            report = self.get_report(detailed=detailed)
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(report)
+            # 边生成边写入，峰值内存与报告大小无关
+            with open(file_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+                separator = ""
+                for chunk in self._iter_report_lines(detailed):
+                    f.write(separator)
+                    f.write(chunk)
+                    separator = "\n"
             logger.info(f"✓ 错误报告已导出到: {file_path}")
         except Exception as e:
             logger.error(f"✗ 导出错误报告失败: {e}")
@@ -621,6 +692,10 @@ class ErrorCollector:
 # ============================================================================
 
 
+_EXCEL_ERROR_RE = re.compile(r"xlsx|openpyxl", re.IGNORECASE)
+_DATABASE_ERROR_RE = re.compile(r"database|sql", re.IGNORECASE)
+
+
 def convert_exception_to_vat_error(
     e: Exception,
     file_path: Optional[str] = None,
@@ -638,25 +713,30 @@ def convert_exception_to_vat_error(
         对应的 VATAuditException 子类实例
     """
 
-    # 根据异常类型选择合适的 VATAuditException 子类
+    # 先按异常类型分派，类型无法判断时再对消息做一次正则扫描
+    target_path = file_path or "unknown"
     if isinstance(e, FileNotFoundError):
-        return FileNotFoundError_(file_path or "unknown", original_error=e)
+        return FileNotFoundError_(target_path, original_error=e)
 
     if isinstance(e, PermissionError):
-        return PermissionError_(file_path or "unknown", original_error=e)
+        return PermissionError_(target_path, original_error=e)
 
     if isinstance(e, MemoryError):
-        return MemoryError_(file_path or "unknown", 0.0, original_error=e)
+        return MemoryError_(target_path, 0.0, original_error=e)
+
+    message = str(e)
+    if isinstance(e, sqlite3.Error):
+        return DatabaseQueryError(message, original_error=e)
 
-    if "xlsx" in str(e).lower() or "openpyxl" in str(e).lower():
-        return ExcelParseError(file_path or "unknown", str(e), original_error=e)
+    if _EXCEL_ERROR_RE.search(message):
+        return ExcelParseError(target_path, message, original_error=e)
 
-    if "database" in str(e).lower() or "sql" in str(e).lower():
-        return DatabaseQueryError(str(e), original_error=e)
+    if _DATABASE_ERROR_RE.search(message):
+        return DatabaseQueryError(message, original_error=e)
 
     # 默认为通用异常
     return VATAuditException(
-        str(e),
+        message,
         category=ErrorCategory.UNKNOWN,
         context=context,
         original_error=e,
@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 import atexit
+import fnmatch
 import multiprocessing
 import os
+import re
 import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import Iterable, List, Optional
 
+import numpy as np
 import pandas as pd
 
 from vat_audit_pipeline.core import models
@@ -17,9 +20,18 @@ from vat_audit_pipeline.core import models
 
 def list_files(root: str | Path, patterns: Iterable[str]) -> list[Path]:
     root_path = Path(root)
-    files: list[Path] = []
-    for pattern in patterns:
-        files.extend(root_path.glob(pattern))
+    patterns = list(patterns)
+    # 仅含文件名通配的模式合并为一个正则，单次 scandir 完成匹配；含路径/递归的模式仍走 Path.glob
+    name_patterns = [p for p in patterns if "/" not in p and "\\" not in p and "**" not in p]
+    path_patterns = [p for p in patterns if p not in name_patterns]
+    files: set[Path] = set()
+    if name_patterns and root_path.is_dir():
+        flags = re.IGNORECASE if os.name == "nt" else 0
+        regex = re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in name_patterns), flags)
+        with os.scandir(root_path) as it:
+            files.update(root_path / entry.name for entry in it if regex.match(entry.name))
+    for pattern in path_patterns:
+        files.update(root_path.glob(pattern))
     return sorted(files)
 
 
@@ -32,28 +44,61 @@ def generate_manifest_filename(prefix: str, timestamp: str) -> str:
     return f"{prefix}_{formatted_time}.csv"
 
 
+def _constant_categorical(value: str, length: int) -> pd.Categorical:
+    # 整列同值：int8 编码 + 单一类别，避免 N 个对象指针和赋值时的 dtype 推断
+    return pd.Categorical.from_codes(np.zeros(length, dtype=np.int8), categories=[value])
+
+
 def add_audit_columns(df: pd.DataFrame, source_file: str, import_time: str) -> pd.DataFrame:
-    df[models.AUDIT_SRC_FILE_COL] = source_file
-    df[models.AUDIT_IMPORT_TIME_COL] = import_time
+    df[models.AUDIT_SRC_FILE_COL] = _constant_categorical(source_file, len(df))
+    df[models.AUDIT_IMPORT_TIME_COL] = _constant_categorical(import_time, len(df))
     return df
 
 
+def _slice_year_fixed_width(dates: pd.Series) -> pd.Series:
+    # object 字符串列先整体编码为定宽 S4（C 层截断前 4 字节），再按 4 字节整数去重，
+    # 仅对少量不同年份做解码后回填，避免逐行 Python 切片；非 ASCII 时抛 UnicodeEncodeError
+    mask = dates.isna().to_numpy()
+    values = dates.to_numpy(dtype=object, copy=True)
+    values[mask] = ""
+    uniques, inverse = np.unique(values.astype("S4").view(np.uint32), return_inverse=True)
+    years = np.array([y.decode("ascii") for y in uniques.view("S4")], dtype=object)[inverse]
+    years[mask] = np.nan
+    return pd.Series(years, index=dates.index, name=dates.name)
+
+
+def _extract_invoice_year(dates: pd.Series) -> pd.Series:
+    # datetime 列直接取年份整数；纯字符串列直接切片，省去 astype(str) 生成的整列中间对象
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates.dt.year.astype("Int64").astype("string")
+    if pd.api.types.infer_dtype(dates, skipna=True) == "string":
+        if dates.dtype == object:
+            try:
+                return _slice_year_fixed_width(dates)
+            except (UnicodeEncodeError, ValueError):
+                pass
+        return dates.str.slice(0, 4)
+    return dates.astype(str).str[:4]
+
+
 def add_invoice_year_column(df: pd.DataFrame) -> pd.DataFrame:
     if models.INVOICE_DATE_COL in df.columns:
-        df[models.INVOICE_YEAR_COL] = df[models.INVOICE_DATE_COL].astype(str).str[:4]
+        df[models.INVOICE_YEAR_COL] = _extract_invoice_year(df[models.INVOICE_DATE_COL])
     else:
         df[models.INVOICE_YEAR_COL] = None
     return df
 
 
 def select_invoice_key_columns(df: pd.DataFrame) -> List[str]:
-    return [col for col in models.INVOICE_KEY_COLS if col in df.columns]
+    cols_set = set(df.columns)
+    return [col for col in models.INVOICE_KEY_COLS if col in cols_set]
 
 
 def add_dedup_capture_time(df: pd.DataFrame, capture_time: str) -> pd.DataFrame:
     if models.AUDIT_IMPORT_TIME_COL not in df.columns:
-        df[models.AUDIT_IMPORT_TIME_COL] = None
-    df[models.DEDUP_CAPTURE_TIME_COL] = capture_time
+        # 可空字符串列以掩码表示缺失，不必为每行保存一个 None 对象
+        df[models.AUDIT_IMPORT_TIME_COL] = pd.Series(pd.NA, index=df.index, dtype="string")
+    df[models.DEDUP_CAPTURE_TIME_COL] = _constant_categorical(capture_time, len(df))
     return df
 
 
@@ -62,7 +107,19 @@ def save_dataframe_to_csv(df: pd.DataFrame, output_path: str) -> None:
 
 
 def filter_dataframe_columns(df: pd.DataFrame, target_columns: List[str]) -> pd.DataFrame:
-    return df.reindex(columns=list(target_columns))
+    target = list(target_columns)
+    # 列已完全一致时直接返回原表，省去 reindex 的整表复制；仅顺序不同时按标签选取，无需补空列
+    if list(df.columns) == target:
+        return df
+    if df.columns.is_unique and len(target) == len(set(target)):
+        existing = set(df.columns)
+        out = df.loc[:, [col for col in target if col in existing]]
+        # 缺失列按目标位置逐个插入全 NaN 的 float64 列（与 reindex 结果一致），不触发整表重排
+        for pos, col in enumerate(target):
+            if col not in existing:
+                out.insert(pos, col, np.nan)
+        return out
+    return df.reindex(columns=target)
 
 
 def ensure_audit_import_time_column(df: pd.DataFrame, default_time: str) -> pd.DataFrame:
@@ -90,13 +147,14 @@ def cleanup_old_temp_files(base_dir: Optional[str], max_age_hours: int = 24) ->
     if not base_dir or not os.path.exists(base_dir):
         return
     cutoff = datetime.now().timestamp() - max_age_hours * 3600
-    for name in os.listdir(base_dir):
-        full_path = os.path.join(base_dir, name)
-        try:
-            if os.path.isdir(full_path) and os.path.getmtime(full_path) < cutoff:
-                shutil.rmtree(full_path, ignore_errors=True)
-        except Exception:
-            continue
+    # DirEntry 缓存 d_type 与 stat 结果，每个子项最多一次 stat 调用
+    with os.scandir(base_dir) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+            except OSError:
+                continue
 
 
 def register_cleanup(current_temp_dir: str) -> None:
@@ -7,7 +7,7 @@ This module is the canonical implementation. The legacy module
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+import time
 from typing import Optional
 
 import pandas as pd
@@ -17,12 +17,19 @@ logger = logging.getLogger("vat_audit")
 
 
 class ProgressLogger:
-    """Simple progress helper that can optionally back tqdm."""
+    """Simple progress helper that can optionally back tqdm.
 
-    def __init__(self, total: int, desc: str = "处理中", use_tqdm: bool = False):
+    Progress messages are buffered and emitted as one write every
+    ``flush_every`` messages (and on ``close``), so high-frequency updates
+    do not turn into one handler write per call.
+    """
+
+    def __init__(self, total: int, desc: str = "处理中", use_tqdm: bool = False, flush_every: int = 64):
         self.total = total
         self.desc = desc
         self.current = 0
+        self._buf: list[str] = []
+        self._flush_every = max(1, flush_every)
         # 检查是否在 GUI 环境中运行，如果是则禁用 tqdm
         import os
         tqdm_disabled = os.environ.get('TQDM_DISABLE', '0') == '1'
@@ -34,19 +41,29 @@ class ProgressLogger:
     def update(self, n: int = 1, msg: Optional[str] = None):
         self.current += n
         if msg:
-            if self.use_tqdm:
-                self.pbar.write(msg)
-            else:
-                logger.info(msg)
+            self._buf.append(msg)
+            if len(self._buf) >= self._flush_every:
+                self.flush()
         if self.use_tqdm:
             self.pbar.update(n)
 
+    def flush(self):
+        if not self._buf:
+            return
+        text = "\n".join(self._buf)
+        self._buf.clear()
+        if self.use_tqdm:
+            self.pbar.write(text)
+        else:
+            logger.info(text)
+
     def set_description(self, desc: str):
         if self.use_tqdm:
             self.pbar.set_description(desc)
         self.desc = desc
 
     def close(self):
+        self.flush()
         if self.use_tqdm and self.pbar:
             self.pbar.close()
 
@@ -97,7 +114,11 @@ def create_progress_bar(total: int, desc: str = "处理中"):
 
 
 class PerformanceTimer:
-    """Context timer for performance logging."""
+    """Context timer for performance logging.
+
+    Uses ``time.perf_counter`` (monotonic), so ``start_time``/``end_time``
+    are counter readings rather than wall-clock datetimes.
+    """
 
     def __init__(self, name: str):
         self.name = name
@@ -106,18 +127,18 @@ class PerformanceTimer:
         self.elapsed_seconds = None
 
     def __enter__(self):
-        self.start_time = datetime.now()
+        self.start_time = time.perf_counter()
         return self
 
     def __exit__(self, *args):
-        self.end_time = datetime.now()
-        self.elapsed_seconds = (self.end_time - self.start_time).total_seconds()
+        self.end_time = time.perf_counter()
+        self.elapsed_seconds = self.end_time - self.start_time
 
     def get_elapsed(self) -> float:
         if self.elapsed_seconds is not None:
             return self.elapsed_seconds
         if self.start_time is not None:
-            return (datetime.now() - self.start_time).total_seconds()
+            return time.perf_counter() - self.start_time
         return 0.0
 
     def log(self, level: str = "info"):
@@ -135,33 +156,47 @@ class MemoryMonitor:
         self.final_mb = None
         self.stream_triggered = False
         self.stream_trigger_count = 0
-
-    def start(self):
+        # 进程句柄与物理内存总量在进程生命周期内不变，只获取一次，避免每次采样重建 Process
+        self._ok = False
+        self._psutil = None
+        self._proc = None
+        self._total_mb = 0.0
         try:
             import psutil
 
-            p = psutil.Process()
-            self.initial_mb = p.memory_info().rss / (1024 * 1024)
+            self._psutil = psutil
+            self._proc = psutil.Process()
+            self._total_mb = psutil.virtual_memory().total / (1024 * 1024)
+            self._ok = True
         except Exception:
             pass
 
-    def update_peak(self):
+    def _rss_mb(self) -> float:
+        return self._proc.memory_info().rss / (1024 * 1024)
+
+    def start(self):
+        if not self._ok:
+            return
         try:
-            import psutil
+            self.initial_mb = self._rss_mb()
+        except Exception:
+            pass
 
-            p = psutil.Process()
-            current_mb = p.memory_info().rss / (1024 * 1024)
+    def update_peak(self):
+        if not self._ok:
+            return
+        try:
+            current_mb = self._rss_mb()
             if self.peak_mb is None or current_mb > self.peak_mb:
                 self.peak_mb = current_mb
         except Exception:
             pass
 
     def end(self):
+        if not self._ok:
+            return
         try:
-            import psutil
-
-            p = psutil.Process()
-            self.final_mb = p.memory_info().rss / (1024 * 1024)
+            self.final_mb = self._rss_mb()
         except Exception:
             pass
 
@@ -180,31 +215,27 @@ class MemoryMonitor:
         return ""
 
     def get_memory_utilization_percent(self) -> float:
+        if not self._ok:
+            return 0.0
         try:
-            import psutil
-
-            total = psutil.virtual_memory().total / (1024 * 1024)
-            current = psutil.Process().memory_info().rss / (1024 * 1024)
-            return (current / total) * 100 if total > 0 else 0
+            return (self._rss_mb() / self._total_mb) * 100 if self._total_mb > 0 else 0
         except Exception:
             return 0.0
 
     def get_available_memory_percent(self) -> float:
+        if not self._ok:
+            return 0.0
         try:
-            import psutil
-
-            vm = psutil.virtual_memory()
-            total_mb = vm.total / (1024 * 1024)
-            available_mb = vm.available / (1024 * 1024)
-            return (available_mb / total_mb) * 100 if total_mb > 0 else 0
+            available_mb = self._psutil.virtual_memory().available / (1024 * 1024)
+            return (available_mb / self._total_mb) * 100 if self._total_mb > 0 else 0
         except Exception:
             return 0.0
 
     def should_trigger_streaming(self, threshold_percent: int = 75) -> bool:
+        if not self._ok:
+            return False
         try:
-            import psutil
-
-            system_memory_percent = psutil.virtual_memory().percent
+            system_memory_percent = self._psutil.virtual_memory().percent
             if system_memory_percent >= threshold_percent:
                 self.stream_triggered = True
                 self.stream_trigger_count += 1
@@ -214,13 +245,14 @@ class MemoryMonitor:
             return False
 
     def check_should_stream_for_file(self, file_size_mb: float, memory_threshold_mb: float = None) -> bool:
+        if not self._ok:
+            return False
         try:
-            import psutil
-
-            available_mb = psutil.virtual_memory().available / (1024 * 1024)
+            vm = self._psutil.virtual_memory()
+            available_mb = vm.available / (1024 * 1024)
             if file_size_mb > available_mb * 0.5:
                 return True
-            if psutil.virtual_memory().percent > 80:
+            if vm.percent > 80:
                 return True
             return False
         except Exception:
@@ -12,6 +12,8 @@ import json
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 
 def _safe_import_psutil():
     try:
@@ -28,13 +30,25 @@ class ResourceMonitor:
 
     memory_samples: List[Dict[str, Any]] = field(default_factory=list)
     cpu_samples: List[Dict[str, Any]] = field(default_factory=list)
+    # psutil handles are resolved once per monitor rather than on every sample.
+    _psutil: Any = field(default=None, init=False, repr=False, compare=False)
+    _process: Any = field(default=None, init=False, repr=False, compare=False)
+    _logical_cores: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._psutil = _safe_import_psutil()
+        if self._psutil is not None:
+            try:
+                self._process = self._psutil.Process()
+                self._logical_cores = self._psutil.cpu_count(logical=True)
+            except Exception:
+                self._psutil = None
 
     def sample_memory(self) -> Optional[Dict[str, Any]]:
-        psutil = _safe_import_psutil()
-        if psutil is None:
+        if self._psutil is None:
             return None
 
-        process = psutil.Process()
+        process = self._process
         mem = process.memory_info()
         sample = {
             "rss_mb": mem.rss / 1024 / 1024,
@@ -45,29 +59,32 @@ class ResourceMonitor:
         return sample
 
     def sample_cpu(self) -> Optional[Dict[str, Any]]:
-        psutil = _safe_import_psutil()
-        if psutil is None:
+        if self._psutil is None:
             return None
 
         sample = {
-            "system_percent": psutil.cpu_percent(interval=None),
-            "logical_cores": psutil.cpu_count(logical=True),
+            "system_percent": self._psutil.cpu_percent(interval=None),
+            "logical_cores": self._logical_cores,
         }
         self.cpu_samples.append(sample)
         return sample
 
-    def _summarize_series(self, series: List[float]) -> Dict[str, float]:
-        if not series:
+    def _summarize_series(self, series: np.ndarray) -> Dict[str, float]:
+        if not series.size:
             return {"min": 0.0, "max": 0.0, "avg": 0.0}
         return {
-            "min": float(min(series)),
-            "max": float(max(series)),
-            "avg": float(sum(series) / len(series)),
+            "min": float(series.min()),
+            "max": float(series.max()),
+            "avg": float(series.mean()),
         }
 
     def generate_report(self) -> Dict[str, Any]:
-        rss_series = [float(s.get("rss_mb", 0.0)) for s in self.memory_samples]
-        cpu_series = [float(s.get("system_percent", 0.0)) for s in self.cpu_samples]
+        rss_series = np.fromiter(
+            (s.get("rss_mb", 0.0) for s in self.memory_samples), dtype=np.float64, count=len(self.memory_samples)
+        )
+        cpu_series = np.fromiter(
+            (s.get("system_percent", 0.0) for s in self.cpu_samples), dtype=np.float64, count=len(self.cpu_samples)
+        )
 
         return {
             "memory": {
@@ -6,62 +6,224 @@ This module is the canonical implementation. The legacy module
 
 from __future__ import annotations
 
+import re
+from datetime import datetime
+
+import numpy as np
 import pandas as pd
 
 
+def _to_datetime_unique(ser, **kwargs):
+	"""Parse only the distinct values of ``ser`` and broadcast the result back.
+
+	Invoice date columns repeat a small set of dates across many rows, so
+	parsing the uniques once and indexing by factorize codes avoids redundant
+	string parsing. Missing values stay NaT.
+	"""
+
+	codes, uniques = pd.factorize(ser)
+	parsed = pd.to_datetime(pd.Series(uniques, dtype=object), errors="coerce", **kwargs).to_numpy()
+	# codes 中的 -1（缺失值）正好取到末尾追加的 NaT
+	values = np.append(parsed, np.datetime64("NaT", "ns"))[codes]
+	return pd.Series(values, index=ser.index, name=ser.name)
+
+
+_NS_PER_DAY = 86_400 * 10**9
+_INT64_MIN = np.iinfo(np.int64).min
+_INT64_MAX = np.iinfo(np.int64).max
+
+
+def _excel_serial_to_datetime(days, origin: str):
+	"""Convert Excel serial day numbers to datetime64[ns] with plain numpy arithmetic.
+
+	Same result as ``pd.to_datetime(days, unit="d", origin=origin, errors="coerce")``
+	(up to sub-microsecond rounding), but out-of-range values become NaT
+	individually instead of raising for the whole column.
+	"""
+
+	origin_ns = np.datetime64(origin, "ns").astype(np.int64)
+	total = days.to_numpy(dtype=np.float64) * _NS_PER_DAY + origin_ns
+	valid = np.isfinite(total) & (total > _INT64_MIN) & (total < _INT64_MAX)
+	out = np.full(len(total), np.datetime64("NaT", "ns"))
+	out[valid] = np.round(total[valid]).astype(np.int64).view("datetime64[ns]")
+	return pd.Series(out, index=days.index, name=days.name)
+
+
+def _format_ymd(dt):
+	"""Format a datetime64 Series as ``%Y-%m-%d`` strings (missing stays NaN).
+
+	Equivalent to ``dt.dt.strftime("%Y-%m-%d")`` but only formats each
+	distinct day once; the per-row work is integer factorize + take.
+	"""
+
+	missing = dt.isna().to_numpy()
+	days = dt.to_numpy().astype("datetime64[D]")
+	codes, uniques = pd.factorize(days.view("i8"))
+	codes[missing] = -1
+	labels = np.append(uniques.astype("datetime64[D]").astype(str).astype(object), np.nan)
+	return pd.Series(labels[codes], index=dt.index, name=dt.name)
+
+
+# 常见的发票日期格式；嗅探命中后显式传 format，避免逐值推断格式
+_DATE_FORMATS = (
+	"%Y-%m-%d",
+	"%Y/%m/%d",
+	"%Y%m%d",
+	"%Y.%m.%d",
+	"%Y-%m-%d %H:%M:%S",
+	"%Y/%m/%d %H:%M:%S",
+	"%Y年%m月%d日",
+)
+
+_ISO8601_RE = re.compile(r"\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?$")
+
+
+def _sniff_date_format(ser, sample_size: int = 20):
+	"""Return a format matching a sample of non-empty strings (a known format, "ISO8601") or None."""
+
+	sample = []
+	for value in ser:
+		if isinstance(value, str):
+			value = value.strip()
+			if value:
+				sample.append(value)
+				if len(sample) >= sample_size:
+					break
+	if not sample:
+		return None
+	for fmt in _DATE_FORMATS:
+		try:
+			for value in sample:
+				datetime.strptime(value, fmt)
+		except ValueError:
+			continue
+		return fmt
+	# 日期与日期时间混排的 ISO 串交给 pandas 的 C 层 ISO8601 解析，不再按首值推断单一格式
+	if all(_ISO8601_RE.match(value) for value in sample):
+		return "ISO8601"
+	return None
+
+
+def _is_plain_numeric(ser) -> bool:
+	return pd.api.types.is_numeric_dtype(ser) and not pd.api.types.is_bool_dtype(ser)
+
+
 def normalize_excel_date_col(ser):
 	"""Parse Excel-like date columns and return (parsed, method, converted, failed)."""
 
-	try:
-		dt = pd.to_datetime(ser, errors="coerce")
-		converted = dt.notna().sum()
-		if converted >= 0.7 * len(ser):
-			return dt.dt.strftime("%Y-%m-%d"), "pd.to_datetime", int(converted), int(len(ser) - converted)
-	except Exception:
-		pass
-	if pd.api.types.is_numeric_dtype(ser):
+	# 数值列是 Excel 序列号（或 yyyymmdd 整数），按纳秒时间戳解析只会得到 1970 年，直接走序列号分支
+	if not _is_plain_numeric(ser):
 		try:
-			dt1 = pd.to_datetime(ser, unit="d", origin="1899-12-30", errors="coerce")
+			dt = _to_datetime_unique(ser, format=_sniff_date_format(ser))
+			converted = dt.notna().sum()
+			if converted >= 0.7 * len(ser):
+				return _format_ymd(dt), "pd.to_datetime", int(converted), int(len(ser) - converted)
+		except Exception:
+			pass
+	else:
+		days = ser.astype(float)
+		try:
+			dt1 = _excel_serial_to_datetime(days, "1899-12-30")
 			if dt1.notna().sum() >= 0.5 * len(ser):
 				converted = int(dt1.notna().sum())
-				return dt1.dt.strftime("%Y-%m-%d"), "excel_1899-12-30", converted, int(len(ser) - converted)
+				return _format_ymd(dt1), "excel_1899-12-30", converted, int(len(ser) - converted)
 		except Exception:
 			pass
 		try:
-			dt2 = pd.to_datetime(ser, unit="d", origin="1904-01-01", errors="coerce")
-			converted = int(dt2.notna().sum())
-			return dt2.dt.strftime("%Y-%m-%d"), "excel_1904-01-01", converted, int(len(ser) - converted)
+			dt2 = _excel_serial_to_datetime(days, "1904-01-01")
+			if dt2.notna().sum() >= 0.5 * len(ser):
+				converted = int(dt2.notna().sum())
+				return _format_ymd(dt2), "excel_1904-01-01", converted, int(len(ser) - converted)
 		except Exception:
 			pass
 	try:
-		dtf = pd.to_datetime(ser.astype(str).str.strip(), errors="coerce")
+		stripped = ser.astype(str).str.strip()
+		dtf = _to_datetime_unique(stripped, format=_sniff_date_format(stripped))
 		converted = int(dtf.notna().sum())
-		return dtf.dt.strftime("%Y-%m-%d"), "final_str_parse", converted, int(len(ser) - converted)
+		return _format_ymd(dtf), "final_str_parse", converted, int(len(ser) - converted)
 	except Exception:
 		return ser, "none", 0, int(len(ser))
 
 
+# 数值清洗需去掉的字符（千分位逗号、全角逗号、百分号），一次 translate 完成
+_NUMERIC_STRIP_TABLE = str.maketrans("", "", ",，%")
+
+
+def _clean_numeric_value(value):
+	if isinstance(value, str):
+		return value.translate(_NUMERIC_STRIP_TABLE)
+	if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+		return value
+	return str(value).translate(_NUMERIC_STRIP_TABLE)
+
+
 def normalize_numeric_col(ser):
 	"""Clean numeric strings (commas, percent sign) then parse to numeric."""
 
-	s = ser.astype(str).str.replace(",", "").str.replace("，", "")
-	s = s.str.replace("%", "")
-	num = pd.to_numeric(s, errors="coerce")
+	if _is_plain_numeric(ser):
+		# 已是数值列：原样返回，不做任何字符串处理或复制
+		num = ser
+	else:
+		cleaned = [_clean_numeric_value(v) for v in ser.to_numpy(dtype=object)]
+		num = pd.Series(pd.to_numeric(cleaned, errors="coerce"), index=ser.index, name=ser.name)
 	converted = int(num.notna().sum())
 	return num, converted, int(len(ser) - converted)
 
 
+def bulk_numeric_normalize(df, cols):
+	"""Normalize several numeric columns in one sweep.
+
+	Returns ``{col: (parsed, converted, failed)}`` with the same per-column
+	result as ``normalize_numeric_col``. Object columns are pulled out as one
+	2D array and cleaned in a single pass before ``pd.to_numeric``.
+	"""
+
+	cols = [c for c in cols if c in df.columns]
+	results = {}
+	text_cols = []
+	for c in cols:
+		ser = df[c]
+		if _is_plain_numeric(ser):
+			num = ser
+			converted = int(num.notna().sum())
+			results[c] = (num, converted, int(len(ser) - converted))
+		else:
+			text_cols.append(c)
+	if text_cols:
+		block = df[text_cols].to_numpy(dtype=object)
+		cleaned = np.array([_clean_numeric_value(v) for v in block.ravel()], dtype=object).reshape(block.shape)
+		for j, c in enumerate(text_cols):
+			num = pd.Series(pd.to_numeric(cleaned[:, j], errors="coerce"), index=df.index, name=c)
+			converted = int(num.notna().sum())
+			results[c] = (num, converted, int(len(num) - converted))
+	return {c: results[c] for c in cols}
+
+
+_TAX_TEXT_TOKENS = frozenset(("免税", "不征税", "免征"))
+_TAX_STRIP_TABLE = str.maketrans("", "", ",％")
+
+
 def normalize_tax_rate_col(ser):
 	"""Parse tax rate values including text tokens like 免税/不征税."""
 
-	s = ser.fillna("").astype(str).str.strip()
-	text_tokens = ["免税", "不征税", "免征"]
-	mask_text = s.isin(text_tokens)
-	s_clean = s.str.rstrip("%").str.replace(",", "").str.replace("％", "").str.strip()
-	num = pd.to_numeric(s_clean, errors="coerce")
+	if _is_plain_numeric(ser):
+		# 数值列不可能含文本税率，缺失值按空值处理（不计入失败），与字符串路径结果一致
+		converted = int(ser.notna().sum())
+		mask_text = pd.Series(False, index=ser.index, name=ser.name)
+		return ser, "tax_parse", converted, 0, 0, mask_text
+
+	# 单次遍历完成去空白、文本税率识别和数值清洗，代替多轮 .str 方法各自生成整列中间结果
+	missing = ser.isna().to_numpy()
+	stripped = ["" if miss else str(v).strip() for v, miss in zip(ser.to_numpy(dtype=object), missing)]
+	n = len(stripped)
+	text_arr = np.fromiter((v in _TAX_TEXT_TOKENS for v in stripped), dtype=bool, count=n)
+	empty_arr = np.fromiter((not v for v in stripped), dtype=bool, count=n)
+	cleaned = [v.rstrip("%").translate(_TAX_STRIP_TABLE).strip() for v in stripped]
+	num = pd.Series(pd.to_numeric(cleaned, errors="coerce"), index=ser.index, name=ser.name)
+	mask_text = pd.Series(text_arr, index=ser.index, name=ser.name)
 	converted = int(num.notna().sum())
-	text_count = int(mask_text.sum())
-	failed = int(((~num.notna()) & (~mask_text) & s.ne("") & ~s.isna()).sum())
+	text_count = int(text_arr.sum())
+	failed = int((num.isna().to_numpy() & ~text_arr & ~empty_arr).sum())
 	return num, "tax_parse", converted, failed, text_count, mask_text
 
 
@@ -74,15 +236,25 @@ def cast_and_record(df, fname, sheet, cast_stats, cast_failures, tax_text_to_zer
 	for c in date_cols:
 		if c in df.columns:
 			parsed, method, converted, failed = normalize_excel_date_col(df[c])
-			mask_failed = pd.isna(parsed) & df[c].notna() & df[c].astype(str).str.strip().ne("")
-			if mask_failed.any():
-				for idx, val in df.loc[mask_failed, c].items():
-					row = {"file": fname, "sheet": sheet, "column": c, "row_index": int(idx), "orig_value": str(val)}
-					if "发票代码" in df.columns:
-						row["发票代码"] = str(df.at[idx, "发票代码"])
-					if "发票号码" in df.columns:
-						row["发票号码"] = str(df.at[idx, "发票号码"])
-					cast_failures.append(pd.DataFrame([row]))
+			# 仅对解析为空但原值非空的候选行做 str/strip 判断，不再把整列转成字符串
+			candidates = (pd.isna(parsed) & df[c].notna()).to_numpy()
+			orig_values = df[c].to_numpy()[candidates].astype(str)
+			keep = np.char.strip(orig_values) != ""
+			if keep.any():
+				# 整列失败记录一次性组装为一个 DataFrame；只切出键列，不复制整行
+				fail_pos = np.flatnonzero(candidates)[keep]
+				key_cols = [k for k in ("发票代码", "发票号码") if k in df.columns]
+				batch = {
+					"file": fname,
+					"sheet": sheet,
+					"column": c,
+					"row_index": df.index[fail_pos].astype(int),
+					"orig_value": orig_values[keep].astype(object),
+				}
+				if key_cols:
+					keys = df.iloc[fail_pos, df.columns.get_indexer(key_cols)].astype(str)
+					batch.update((k, keys[k].to_numpy()) for k in key_cols)
+				cast_failures.append(pd.DataFrame(batch))
 			df[c] = parsed
 			cast_stats.append(
 				{
@@ -96,6 +268,8 @@ def cast_and_record(df, fname, sheet, cast_stats, cast_failures, tax_text_to_zer
 				}
 			)
 
+	# 普通数值列一次批量清洗，税率列单独处理文本税率
+	bulk = bulk_numeric_normalize(df, [c for c in num_cols if c != "税率"])
 	for c in num_cols:
 		if c in df.columns:
 			if c == "税率":
@@ -139,7 +313,7 @@ def cast_and_record(df, fname, sheet, cast_stats, cast_failures, tax_text_to_zer
 						}
 					)
 			else:
-				parsed_num, converted, failed = normalize_numeric_col(df[c])
+				parsed_num, converted, failed = bulk[c]
 				df[c] = parsed_num
 				cast_stats.append(
 					{
@@ -160,5 +334,6 @@ __all__ = [
 	"normalize_excel_date_col",
 	"normalize_numeric_col",
 	"normalize_tax_rate_col",
+	"bulk_numeric_normalize",
 	"cast_and_record",
 ]
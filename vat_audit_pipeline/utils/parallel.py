@@ -4,8 +4,8 @@ from __future__ import annotations
 
 import multiprocessing
 import time
-from concurrent.futures import ThreadPoolExecutor
-from typing import Callable, Iterable, Optional, TypeVar, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, Optional, Tuple, TypeVar, Union
 
 from vat_audit_pipeline.core import models
 
@@ -14,9 +14,40 @@ T = TypeVar("T")
 R = TypeVar("R")
 
 
-def map_concurrent(fn: Callable[[T], R], items: Iterable[T], max_workers: int = 4) -> list[R]:
+def map_concurrent(fn: Callable[[T], R], items: Iterable[T], max_workers: int = 4, ordered: bool = True) -> list[R]:
+    """Thread-based map, for I/O-bound work (file open/read, queue puts).
+
+    Results are collected as each task finishes, so one slow item does not
+    hold back the others (and a failure surfaces as soon as it happens).
+    With ``ordered=True`` (default) they are returned in input order;
+    ``ordered=False`` returns them in completion order.
+    """
+
+    items = list(items)
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        return list(executor.map(fn, items))
+        futures = {executor.submit(fn, item): i for i, item in enumerate(items)}
+        if not ordered:
+            return [fut.result() for fut in as_completed(futures)]
+        results: list = [None] * len(items)
+        for fut in as_completed(futures):
+            results[futures[fut]] = fut.result()
+        return results
+
+
+def map_concurrent_procs(fn: Callable[[T], R], items: Iterable[T], max_workers: int = 4, chunksize: int = 1) -> list[R]:
+    """Process-based map, for CPU-bound pandas work that holds the GIL.
+
+    Uses the ``spawn`` start method so behaviour matches Windows; ``fn`` and
+    each item must therefore be picklable (``fn`` defined at module level).
+    ``chunksize`` batches many small items per inter-process round trip.
+    """
+
+    items = list(items)
+    if not items:
+        return []
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max(1, min(max_workers, len(items))), mp_context=ctx) as executor:
+        return list(executor.map(fn, items, chunksize=max(1, chunksize)))
 
 
 def calculate_optimal_workers(
@@ -44,7 +75,22 @@ def calculate_optimal_workers(
     return max(1, target)
 
 
-def measure_disk_busy_percent(sample_seconds: float = 0.25) -> Optional[float]:
+# 磁盘繁忙度采样需要阻塞 sample_seconds；短时间内重复调用直接复用上次结果
+DISK_BUSY_CACHE_TTL = 5.0
+_last_disk_busy: Optional[Tuple[float, Optional[float]]] = None
+
+
+def measure_disk_busy_percent(sample_seconds: float = 0.25, max_age: float = DISK_BUSY_CACHE_TTL) -> Optional[float]:
+    global _last_disk_busy
+    cached = _last_disk_busy
+    if cached is not None and time.monotonic() - cached[0] < max_age:
+        return cached[1]
+    value = _sample_disk_busy_percent(sample_seconds)
+    _last_disk_busy = (time.monotonic(), value)
+    return value
+
+
+def _sample_disk_busy_percent(sample_seconds: float) -> Optional[float]:
     try:
         import psutil
 
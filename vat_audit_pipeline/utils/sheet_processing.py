@@ -6,11 +6,18 @@ This module is the canonical implementation. The legacy module
 
 from __future__ import annotations
 
+import codecs
 from dataclasses import dataclass
-from typing import Any, Optional, Tuple
+from typing import Any, Iterable, Optional, Tuple
 
 import pandas as pd
 
+from vat_audit_pipeline.utils.file_handlers import (
+    add_audit_columns,
+    add_invoice_year_column,
+    filter_dataframe_columns,
+)
+
 
 @dataclass
 class PipelineSettings:
@@ -45,6 +52,9 @@ class PipelineSettings:
     max_failure_samples: int = 100
     tax_text_to_zero: bool = True
 
+    # 非流式 sheet 的临时落盘格式："parquet"（需 pyarrow）或 "csv"
+    spill_format: str = "parquet"
+
     config: Optional[Any] = None
 
     @classmethod
@@ -82,6 +92,9 @@ class PipelineSettings:
 
             settings.max_failure_samples = config_obj.max_failure_samples
             settings.tax_text_to_zero = config_obj.tax_text_to_zero
+            settings.spill_format = resolve_spill_format(
+                config_obj.get("performance", "spill_format", default=settings.spill_format)
+            )
 
             settings.config = config_obj
         except Exception as e:
@@ -181,6 +194,23 @@ def get_sheet_handler(
     return None
 
 
+# 取值高度重复的文本列（同一发票多行明细共享代码/号码，购销方名称反复出现），转为 category 节省内存
+CATEGORY_CANDIDATE_COLUMNS = ("发票代码", "发票号码", "商品名称", "购买方名称", "销售方名称")
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def _categorize_repetitive_columns(df: pd.DataFrame, columns: Iterable[str]) -> pd.DataFrame:
+    n = len(df)
+    if n == 0:
+        return df
+    for col in columns:
+        if col not in df.columns or not pd.api.types.is_object_dtype(df[col].dtype):
+            continue
+        if df[col].nunique() < CATEGORY_MAX_UNIQUE_RATIO * n:
+            df[col] = df[col].astype("category")
+    return df
+
+
 def normalize_sheet_dataframe(
     df: pd.DataFrame,
     sheet_name: str,
@@ -192,8 +222,9 @@ def normalize_sheet_dataframe(
     cast_failures: list,
     errors: list,
     extract_year: bool = True,
+    category_columns: Optional[Iterable[str]] = CATEGORY_CANDIDATE_COLUMNS,
 ) -> Tuple[pd.DataFrame, int]:
-    """规范化一个 DataFrame：类型化、添加审计列、重新索引、提取年份。"""
+    """规范化一个 DataFrame：类型化、添加审计列、重复文本列转 category、提取年份、重新索引。"""
 
     try:
         df = cast_fn(df, file_name, sheet_name, cast_stats, cast_failures)
@@ -209,19 +240,86 @@ def normalize_sheet_dataframe(
         )
         raise
 
-    df["AUDIT_SRC_FILE"] = file_name
-    df["AUDIT_IMPORT_TIME"] = process_time
+    df = add_audit_columns(df, file_name, process_time)
+    if category_columns:
+        df = _categorize_repetitive_columns(df, category_columns)
 
-    if extract_year and "开票日期" in df.columns:
-        df["开票年份"] = df["开票日期"].astype(str).str[:4]
+    if extract_year:
+        # 与 ODS 导入共用年份提取（按 dtype 分支，不经 astype(str) 整列复制）
+        df = add_invoice_year_column(df)
     else:
         df["开票年份"] = None
 
-    df = df.reindex(columns=list(target_columns))
+    # 列已对齐时原样返回，避免 reindex 的整表复制
+    df = filter_dataframe_columns(df, list(target_columns))
 
     return df, len(df)
 
 
+def _write_temp_csv(df: pd.DataFrame, temp_csv_path: str) -> None:
+    """写临时 CSV（UTF-8 BOM）：优先用 pyarrow 的 C++ 写出器，未安装或类型不兼容时回退 pandas。"""
+
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        pacsv = None
+    if pacsv is not None:
+        try:
+            # 混合类型的 object 列等无法转换为 Arrow 表时在写文件前就会抛错
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            with open(temp_csv_path, "wb") as f:
+                f.write(codecs.BOM_UTF8)
+                pacsv.write_csv(table, f)
+            return
+        except Exception:
+            pass
+    df.to_csv(temp_csv_path, index=False, encoding="utf-8-sig")
+
+
+def resolve_spill_format(spill_format: str) -> str:
+    """返回实际可用的落盘格式：请求 parquet 但未安装 pyarrow 时退回 csv。"""
+
+    if str(spill_format).lower() == "parquet":
+        try:
+            import pyarrow.parquet  # noqa: F401
+
+            return "parquet"
+        except ImportError:
+            return "csv"
+    return "csv"
+
+
+def _write_temp_parquet(df: pd.DataFrame, temp_path: str) -> None:
+    """写临时 Parquet：列式压缩并保留 dtype，合并入库时无需重新解析文本。"""
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Excel 读入的混合类型 object 列（如数字与文本混排的发票号码）按文本落盘，与 CSV 行为一致；
+        # 重复值较多的此类列已被转为 category，其类别同样是混合类型，一并转为文本
+        df = df.copy()
+        for col in df.columns:
+            dtype = df[col].dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                dtype = dtype.categories.dtype
+            if pd.api.types.is_object_dtype(dtype):
+                df[col] = df[col].astype("string")
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, temp_path, compression="snappy")
+
+
+def _write_spill_file(df: pd.DataFrame, temp_path: str) -> str:
+    if temp_path.lower().endswith(".parquet"):
+        _write_temp_parquet(df, temp_path)
+        return "Parquet"
+    _write_temp_csv(df, temp_path)
+    return "CSV"
+
+
 def write_to_csv_or_queue(
     df: pd.DataFrame,
     target_table: str,
@@ -230,18 +328,18 @@ def write_to_csv_or_queue(
     use_csv_fallback: bool,
     queue_timeout: float = 5.0,
 ) -> Tuple[bool, str]:
-    """尝试写入 DataFrame 到队列，失败则回退到 CSV。"""
+    """尝试写入 DataFrame 到队列，失败则回退到临时文件（路径以 .parquet 结尾时写 Parquet，否则写 CSV）。"""
 
     if queue_obj is None or use_csv_fallback:
-        df.to_csv(temp_csv_path, index=False, encoding="utf-8-sig")
-        return False, f"写入 CSV: {temp_csv_path}"
+        fmt = _write_spill_file(df, temp_csv_path)
+        return False, f"写入 {fmt}: {temp_csv_path}"
 
     try:
         queue_obj.put((target_table, df), timeout=queue_timeout)
         return True, f"入队成功: {target_table}"
     except Exception as e:
-        df.to_csv(temp_csv_path, index=False, encoding="utf-8-sig")
-        return False, f"队列失败，回退到 CSV: {temp_csv_path} ({e})"
+        fmt = _write_spill_file(df, temp_csv_path)
+        return False, f"队列失败，回退到 {fmt}: {temp_csv_path} ({e})"
 
 
 __all__ = [
@@ -250,5 +348,6 @@ __all__ = [
     "SheetTypeMapping",
     "get_sheet_handler",
     "normalize_sheet_dataframe",
+    "resolve_spill_format",
     "write_to_csv_or_queue",
 ]
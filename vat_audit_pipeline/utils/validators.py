@@ -4,9 +4,11 @@ from __future__ import annotations
 
 import json
 import os
+import re
 from functools import wraps
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from vat_audit_pipeline.core import models
@@ -61,34 +63,53 @@ def validate_input_file(file_path: str, max_file_mb: float) -> Tuple[bool, str]:
     return True, "ok"
 
 
+ERROR_REMEDIES: Dict[str, str] = {
+    "FileNotFoundError": "检查文件路径是否正确并存在（确认文件名和目录）。",
+    "PermissionError": "检查该文件/目录的读写权限或是否被其他进程锁定。",
+    "MemoryError": "数据量可能过大，考虑增加内存/使用流式处理或减小 chunk 大小。",
+    "ValueError": "数据格式错误或类型不匹配，请检查字段值及格式。",
+    "KeyError": "缺少预期列，检查源表头是否包含必要字段。",
+    "UnicodeDecodeError": "文件编码不匹配，尝试以 UTF-8/GBK 打开或检查文件来源。",
+    "OSError": "操作系统级错误，请检查路径、权限和磁盘空间。",
+    "TimeoutError": "操作超时，重试或增大超时设置。",
+    "InvalidFileException": "Excel文件可能已损坏或格式不正确，请检查文件是否可以正常打开。",
+    "InvalidFileFormatException": "Excel文件格式不正确或已损坏，请验证文件完整性。",
+    "FileLockedException": "文件被其他程序锁定，请关闭Excel应用程序或其他可能使用该文件的程序。",
+}
+
+# 未登记的错误类型按消息关键词推断建议（按顺序匹配，首条命中生效）
+_REMEDY_KEYWORD_RULES: Tuple[Tuple[Tuple[str, ...], str], ...] = (
+    (("permission",), "PermissionError"),
+    (("not found",), "FileNotFoundError"),
+    (("invalid file", "corrupt"), "InvalidFileException"),
+    (("lock", "access denied"), "FileLockedException"),
+)
+
+
 def suggest_remedy_for_error(error_type: Optional[str], message: Optional[str] = None) -> str:
-    mapping = {
-        "FileNotFoundError": "检查文件路径是否正确并存在（确认文件名和目录）。",
-        "PermissionError": "检查该文件/目录的读写权限或是否被其他进程锁定。",
-        "MemoryError": "数据量可能过大，考虑增加内存/使用流式处理或减小 chunk 大小。",
-        "ValueError": "数据格式错误或类型不匹配，请检查字段值及格式。",
-        "KeyError": "缺少预期列，检查源表头是否包含必要字段。",
-        "UnicodeDecodeError": "文件编码不匹配，尝试以 UTF-8/GBK 打开或检查文件来源。",
-        "OSError": "操作系统级错误，请检查路径、权限和磁盘空间。",
-        "TimeoutError": "操作超时，重试或增大超时设置。",
-        "InvalidFileException": "Excel文件可能已损坏或格式不正确，请检查文件是否可以正常打开。",
-        "InvalidFileFormatException": "Excel文件格式不正确或已损坏，请验证文件完整性。",
-        "FileLockedException": "文件被其他程序锁定，请关闭Excel应用程序或其他可能使用该文件的程序。",
-    }
     if not error_type:
         return ""
-    suggestion = mapping.get(error_type, "")
+    suggestion = ERROR_REMEDIES.get(error_type, "")
     if not suggestion and message:
-        msg = str(message)
-        if "permission" in msg.lower():
-            suggestion = mapping.get("PermissionError")
-        elif "not found" in msg.lower():
-            suggestion = mapping.get("FileNotFoundError")
-        elif "invalid file" in msg.lower() or "corrupt" in msg.lower():
-            suggestion = mapping.get("InvalidFileException")
-        elif "lock" in msg.lower() or "access denied" in msg.lower():
-            suggestion = mapping.get("FileLockedException")
-    return suggestion or ""
+        msg = str(message).lower()
+        for keywords, remedy_type in _REMEDY_KEYWORD_RULES:
+            if any(keyword in msg for keyword in keywords):
+                return ERROR_REMEDIES[remedy_type]
+    return suggestion
+
+
+def _suggest_remedies(error_types: pd.Series, messages: pd.Series) -> np.ndarray:
+    """suggest_remedy_for_error 的整列版本：类型映射 + 关键词条件一次 np.select 选出。"""
+
+    has_type = error_types.notna().to_numpy() & error_types.astype(str).ne("").to_numpy()
+    mapped = error_types.map(ERROR_REMEDIES)
+    msg_low = messages.fillna("").astype(str).str.lower()
+    conditions = [mapped.notna().to_numpy()]
+    choices = [mapped.to_numpy(dtype=object)]
+    for keywords, remedy_type in _REMEDY_KEYWORD_RULES:
+        conditions.append(msg_low.str.contains("|".join(map(re.escape, keywords))).to_numpy())
+        choices.append(ERROR_REMEDIES[remedy_type])
+    return np.where(has_type, np.select(conditions, choices, default=""), "").astype(object)
 
 
 def write_error_logs(
@@ -99,13 +120,17 @@ def write_error_logs(
     if not error_logs:
         return None, None
     output_dir = output_dir or os.path.join(os.getcwd(), "Outputs")
-    enriched = []
-    for e in error_logs:
-        e2 = dict(e)
-        if "suggestion" not in e2 or not e2.get("suggestion"):
-            e2["suggestion"] = suggest_remedy_for_error(e2.get("error_type"), e2.get("message"))
-        enriched.append(e2)
-    err_df = pd.DataFrame(enriched)
+    err_df = pd.DataFrame.from_records(error_logs)
+    if "suggestion" not in err_df.columns:
+        err_df["suggestion"] = ""
+    missing = (err_df["suggestion"].isna() | err_df["suggestion"].eq("")).to_numpy()
+    if missing.any():
+        empty = pd.Series(None, index=err_df.index, dtype=object)
+        err_df.loc[missing, "suggestion"] = _suggest_remedies(
+            err_df.get("error_type", empty)[missing], err_df.get("message", empty)[missing]
+        )
+    # JSON 按原始记录输出（保留整数类型、不补缺失字段），仅附加计算出的 suggestion
+    enriched = [dict(e, suggestion=suggestion) for e, suggestion in zip(error_logs, err_df["suggestion"].tolist())]
     basefn = f"{models.ERROR_LOG_PREFIX}_{format_timestamp_for_filename(process_time)}"
     csv_path = os.path.join(output_dir, f"{basefn}.csv")
     json_path = os.path.join(output_dir, f"{basefn}.json")
@@ -116,5 +141,5 @@ def write_error_logs(
             json.dump(enriched, f, ensure_ascii=False, indent=2)
     except Exception:
         pass
-    _progress(f"导出结构化错误日志: {csv_path} & {json_path} (共 {len(enriched)} 条记录)")
+    _progress(f"导出结构化错误日志: {csv_path} & {json_path} (共 {len(err_df)} 条记录)")
     return csv_path, json_path
\ No newline at end of file
@@ -13,6 +13,8 @@
 """
 
 import os
+import re
+import subprocess
 import sys
 import multiprocessing
 
@@ -33,11 +35,14 @@ if 'QT_QPA_PLATFORM' not in os.environ:
 
 import ctypes
 import tkinter as tk
-from tkinter import ttk, filedialog, scrolledtext, messagebox
+from tkinter import ttk, filedialog, messagebox
 import tkinter.font as tkfont
 import threading
+import asyncio
 import queue
+import collections
 import logging
+import logging.handlers
 from pathlib import Path
 from datetime import datetime
 import traceback
@@ -53,83 +58,8 @@ def _debug_log(msg: str):
         logging.debug(f"[GUI] {msg}")
 
 
-class TextHandler(logging.Handler):
-    """自定义日志处理器，将日志输出到 GUI 文本框"""
-    
-    def __init__(self, text_widget, queue_obj):
-        super().__init__()
-        self.text_widget = text_widget
-        self.queue = queue_obj
-        
-    def emit(self, record):
-        """发送日志记录到队列"""
-        try:
-            msg = self.format(record)
-            self.queue.put(msg)
-        except Exception:
-            self.handleError(record)
-
-
-class VATAuditGUI:
-    """增值税发票审计系统 GUI 主窗口"""
-    
-    def __init__(self, root):
-        _debug_log(f"VATAuditGUI.__init__ 开始, root={root}")
-        self.root = root
-        self.root.title("增值税发票审计系统 v1.0.1")
-        self.root.geometry("1000x700")
-        _debug_log("窗口标题和尺寸已设置")
-        
-        # 设置窗口图标（如果存在）
-        try:
-            icon_path = Path(__file__).parent / "icon.ico"
-            if icon_path.exists():
-                self.root.iconbitmap(str(icon_path))
-        except:
-            pass
-        
-        # 初始化变量
-        self.processing = False
-        self.log_queue = queue.Queue()
-        
-        # 默认路径
-        self.default_paths = {
-            'input_dir': str(Path.cwd() / "Source_Data"),
-            'output_dir': str(Path.cwd() / "Outputs"),
-            'database_dir': str(Path.cwd() / "Database"),
-        }
-        
-        # 创建菜单栏
-        self._create_menubar()
-        
-        # 创建 GUI 组件
-        self._create_widgets()
-        self._setup_logging()
-        
-        # 启动日志更新循环
-        self.root.after(100, self._update_log_display)
-        
-        # 窗口关闭时的清理
-        self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
-        
-    def _create_menubar(self):
-        """创建菜单栏"""
-        menubar = tk.Menu(self.root)
-        self.root.config(menu=menubar)
-        
-        # 帮助菜单
-        help_menu = tk.Menu(menubar, tearoff=0)
-        menubar.add_cascade(label="帮助", menu=help_menu)
-        
-        help_menu.add_command(label="工作进程数说明", command=self._show_worker_count_help)
-        help_menu.add_command(label="业务标签使用指南", command=self._show_business_tag_help)
-        help_menu.add_command(label="并行处理配置", command=self._show_parallel_config_help)
-        help_menu.add_separator()
-        help_menu.add_command(label="关于本程序", command=self._show_about)
-    
-    def _show_worker_count_help(self):
-        """显示工作进程数帮助"""
-        help_text = """
+# ============ 帮助菜单文本（模块级常量） ============
+_WORKER_COUNT_HELP = """
 【工作进程数（Worker Count）说明】
 
 工作进程数控制并行导入时同时处理多少个 Excel 文件。
@@ -181,11 +111,8 @@ worker=8（高并发）
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 📧 版权与联系：31918424@qq.com
         """
-        messagebox.showinfo("工作进程数说明", help_text)
-    
-    def _show_business_tag_help(self):
-        """显示业务标签帮助"""
-        help_text = """
+
+_BUSINESS_TAG_HELP = """
 【业务标签（Business Tag）使用指南】
 
 业务标签为数据库、表和临时文件添加前缀，
@@ -241,11 +168,8 @@ worker=8（高并发）
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 📧 版权与联系：31918424@qq.com
         """
-        messagebox.showinfo("业务标签使用指南", help_text)
-    
-    def _show_parallel_config_help(self):
-        """显示并行处理配置帮助"""
-        help_text = """
+
+_PARALLEL_CONFIG_HELP = """
 【并行处理配置说明】
 
 系统支持多种方式控制并行导入的行为。
@@ -314,11 +238,8 @@ worker=8（高并发）
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 📧 版权与联系：31918424@qq.com
         """
-        messagebox.showinfo("并行处理配置", help_text)
-    
-    def _show_about(self):
-        """显示关于对话框"""
-        about_text = """
+
+_ABOUT_TEXT = """
 增值税发票审计系统
 VAT Invoice Audit Pipeline v1.0.1
 
@@ -354,7 +275,138 @@ VAT Invoice Audit Pipeline v1.0.1
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 © 2025-2026 ToAudit数智工坊
         """
-        messagebox.showinfo("关于本程序", about_text)
+
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """同进程队列无需序列化：直接入队原始 LogRecord，格式化全部留给 QueueListener 线程"""
+    
+    def prepare(self, record):
+        # 默认实现会在写日志的线程里先格式化一遍并复制记录；这里原样入队
+        return record
+
+
+class _GuiSink(logging.Handler):
+    """QueueListener 线程中的日志出口：格式化后以 (颜色标签, 日志文本) 追加到 GUI 缓冲区"""
+    
+    # 日志级别直接映射颜色标签，无需在 UI 线程里逐条扫描文本
+    LEVEL_TAGS = {'CRITICAL': 'ERROR', 'ERROR': 'ERROR', 'WARNING': 'WARNING', 'DEBUG': 'DEBUG'}
+    # 三个关键字合并为一个预编译正则，一次扫描完成判断
+    SUCCESS_RE = re.compile('成功|完成|SUCCESS')
+    
+    def __init__(self, buffer):
+        super().__init__()
+        self.buffer = buffer
+        
+    @classmethod
+    def record_tag(cls, record):
+        """根据 LogRecord 的级别确定颜色标签；INFO 中的成功/完成提示用 SUCCESS 高亮"""
+        tag = cls.LEVEL_TAGS.get(record.levelname)
+        if tag is not None:
+            return tag
+        if cls.SUCCESS_RE.search(record.getMessage()):
+            return 'SUCCESS'
+        return 'INFO'
+        
+    def emit(self, record):
+        """追加 (颜色标签, 日志文本) 到缓冲区（deque.append 线程安全）"""
+        try:
+            msg = self.format(record)
+            self.buffer.append((self.record_tag(record), msg))
+        except Exception:
+            self.handleError(record)
+
+
+class VATAuditGUI:
+    """增值税发票审计系统 GUI 主窗口"""
+    
+    # 日志文本框最多保留的行数，超出后丢弃最早的行，避免长时间运行后重绘变慢
+    MAX_LOG_LINES = 5000
+    # 待显示日志缓冲区上限：Tk 来不及刷新时丢弃最早的记录，内存不会无限增长
+    LOG_BUFFER_MAXLEN = 10000
+    # 日志轮询间隔（毫秒）的上下限
+    LOG_POLL_MIN_MS = 20
+    LOG_POLL_MAX_MS = 200
+    
+    def __init__(self, root):
+        _debug_log(f"VATAuditGUI.__init__ 开始, root={root}")
+        self.root = root
+        self.root.title("增值税发票审计系统 v1.0.1")
+        self.root.geometry("1000x700")
+        _debug_log("窗口标题和尺寸已设置")
+        
+        # 设置窗口图标（如果存在）
+        try:
+            icon_path = Path(__file__).parent / "icon.ico"
+            if icon_path.exists():
+                self.root.iconbitmap(str(icon_path))
+        except:
+            pass
+        
+        # 初始化变量
+        self.processing = False
+        # 生产者线程只把 LogRecord 放入 log_queue；QueueListener 线程负责格式化并写入 _log_buffer，
+        # Tk 主循环定时从 _log_buffer 取出显示
+        self.log_queue = queue.Queue()
+        self._log_buffer = collections.deque(maxlen=self.LOG_BUFFER_MAXLEN)
+        self._log_listener = None
+        self._poll_empty_ticks = 0
+        # 后台线程投递的 UI 更新 (函数, 参数)，由主线程轮询执行
+        self._ui_events = collections.deque()
+        self._async_loop = self._start_async_loop()
+        self._pipeline_main = None
+        asyncio.run_coroutine_threadsafe(self._warmup_imports(), self._async_loop)
+        self._max_log_lines = self.MAX_LOG_LINES
+        
+        # 默认路径
+        self.default_paths = {
+            'input_dir': str(Path.cwd() / "Source_Data"),
+            'output_dir': str(Path.cwd() / "Outputs"),
+            'database_dir': str(Path.cwd() / "Database"),
+        }
+        
+        # 创建菜单栏
+        self._create_menubar()
+        
+        # 创建 GUI 组件
+        self._create_widgets()
+        self._setup_logging()
+        
+        # 启动日志更新循环
+        self.root.after(100, self._update_log_display)
+        
+        # 窗口关闭时的清理
+        self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
+        
+    def _create_menubar(self):
+        """创建菜单栏"""
+        menubar = tk.Menu(self.root)
+        self.root.config(menu=menubar)
+        
+        # 帮助菜单
+        help_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="帮助", menu=help_menu)
+        
+        help_menu.add_command(label="工作进程数说明", command=self._show_worker_count_help)
+        help_menu.add_command(label="业务标签使用指南", command=self._show_business_tag_help)
+        help_menu.add_command(label="并行处理配置", command=self._show_parallel_config_help)
+        help_menu.add_separator()
+        help_menu.add_command(label="关于本程序", command=self._show_about)
+    
+    def _show_worker_count_help(self):
+        """显示工作进程数帮助"""
+        messagebox.showinfo("工作进程数说明", _WORKER_COUNT_HELP)
+    
+    def _show_business_tag_help(self):
+        """显示业务标签帮助"""
+        messagebox.showinfo("业务标签使用指南", _BUSINESS_TAG_HELP)
+    
+    def _show_parallel_config_help(self):
+        """显示并行处理配置帮助"""
+        messagebox.showinfo("并行处理配置", _PARALLEL_CONFIG_HELP)
+    
+    def _show_about(self):
+        """显示关于对话框"""
+        messagebox.showinfo("关于本程序", _ABOUT_TEXT)
     
     def _create_widgets(self):
         """创建所有 GUI 组件"""
@@ -435,9 +487,17 @@ VAT Invoice Audit Pipeline v1.0.1
         log_frame = ttk.LabelFrame(main_paned, text="运行日志", padding=5)
         main_paned.add(log_frame, weight=2)
         
-        # 创建滚动文本框（使用更适合中文显示的字体）
-        self.log_text = scrolledtext.ScrolledText(log_frame, wrap=tk.WORD, height=20, font=("Microsoft YaHei UI", 10))
-        self.log_text.pack(fill=tk.BOTH, expand=True)
+        # 创建文本框 + 滚动条（使用更适合中文显示的字体）
+        # 只读日志区不需要撤销栈：显式关闭 undo/autoseparators 并将 maxundo 置 0，批量插入和裁剪时不记录编辑历史
+        log_scrollbar = ttk.Scrollbar(log_frame, orient=tk.VERTICAL)
+        self.log_text = tk.Text(
+            log_frame, wrap=tk.WORD, height=20, font=("Microsoft YaHei UI", 10),
+            undo=False, maxundo=0, autoseparators=False, yscrollcommand=log_scrollbar.set,
+        )
+        log_scrollbar.config(command=self.log_text.yview)
+        log_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.log_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.log_text.bind('<Map>', self._flush_log_buffer)
         
         # 配置日志颜色标签
         self.log_text.tag_config('ERROR', foreground='red')
@@ -461,12 +521,14 @@ VAT Invoice Audit Pipeline v1.0.1
         # 清除现有处理器
         root_logger.handlers.clear()
         
-        # 添加 GUI 处理器
-        gui_handler = TextHandler(self.log_text, self.log_queue)
-        gui_handler.setLevel(logging.DEBUG)
+        # 添加 GUI 处理器：日志线程只入队，格式化在监听线程完成
+        gui_sink = _GuiSink(self._log_buffer)
+        gui_sink.setLevel(logging.DEBUG)
         formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s', datefmt='%H:%M:%S')
-        gui_handler.setFormatter(formatter)
-        root_logger.addHandler(gui_handler)
+        gui_sink.setFormatter(formatter)
+        root_logger.addHandler(_RecordQueueHandler(self.log_queue))
+        self._log_listener = logging.handlers.QueueListener(self.log_queue, gui_sink, respect_handler_level=True)
+        self._log_listener.start()
         
         # 添加文件日志处理器
         try:
@@ -486,60 +548,100 @@ VAT Invoice Audit Pipeline v1.0.1
         logging.info("=" * 60)
         
     def _update_log_display(self):
-        """定期从队列中获取日志并显示"""
+        """定期从缓冲区获取日志并显示"""
+        flushed = 0
+        try:
+            # 后台任务投递的状态/进度更新在主线程统一执行
+            flushed += self._drain_ui_events()
+            # 窗口最小化或日志区不可见时不写文本框，日志留在缓冲区，重新显示时（<Map>）再一次性写入
+            if self.log_text.winfo_viewable():
+                flushed += self._flush_log_buffer()
+        finally:
+            # 自适应轮询：有日志时 20ms 后再取，连续空闲时逐步放慢到 200ms
+            if flushed:
+                self._poll_empty_ticks = 0
+                delay = self.LOG_POLL_MIN_MS
+            else:
+                self._poll_empty_ticks += 1
+                delay = min(self.LOG_POLL_MAX_MS, 50 * self._poll_empty_ticks)
+            self.root.after(delay, self._update_log_display)
+            
+    def _flush_log_buffer(self, event=None):
+        """取出缓冲区中全部日志，一次性写入文本框，返回写入条数"""
+        entries = []
         try:
             while True:
-                msg = self.log_queue.get_nowait()
-                self._append_log(msg)
-        except queue.Empty:
+                entries.append(self._log_buffer.popleft())
+        except IndexError:
             pass
-        finally:
-            # 每 100ms 检查一次
-            self.root.after(100, self._update_log_display)
+        # 本轮取出的日志一次性写入，而不是每条日志各触发一次插入和滚动
+        if entries:
+            self._append_logs(entries)
+        return len(entries)
             
-    def _append_log(self, msg):
+    def _append_log(self, msg, tag='INFO'):
         """添加日志到文本框"""
-        # 确定日志级别并应用颜色
-        tag = 'INFO'
-        if '[ERROR]' in msg or 'ERROR' in msg:
-            tag = 'ERROR'
-        elif '[WARNING]' in msg or 'WARNING' in msg:
-            tag = 'WARNING'
-        elif '[DEBUG]' in msg:
-            tag = 'DEBUG'
-        elif '成功' in msg or '完成' in msg or 'SUCCESS' in msg:
-            tag = 'SUCCESS'
-            
-        self.log_text.insert(tk.END, msg + '\n', tag)
+        self._append_logs([(tag, msg)])
+        
+    def _append_logs(self, entries):
+        """批量添加 (颜色标签, 日志文本) 到文本框：相邻同色日志合并为一段，整批只调用一次 insert"""
+        if not entries:
+            return
+        segments = []
+        run, run_tag = [], None
+        for tag, msg in entries:
+            if tag != run_tag and run:
+                segments.extend(('\n'.join(run) + '\n', run_tag))
+                run = []
+            run.append(msg)
+            run_tag = tag
+        segments.extend(('\n'.join(run) + '\n', run_tag))
+        # Text.insert 接受多组 (文本, 标签)，按顺序写入
+        self.log_text.insert(tk.END, *segments)
+        self._trim_log()
         self.log_text.see(tk.END)  # 自动滚动到底部
         
+    def _trim_log(self):
+        """超出行数上限时一次性删除最早的行"""
+        # 每条日志以换行结尾，end-1c 落在末尾空行上，需减去这一行
+        line_count = int(self.log_text.index('end-1c').split('.')[0]) - 1
+        overflow = line_count - self._max_log_lines
+        if overflow > 0:
+            self.log_text.delete('1.0', f'{overflow + 1}.0')
+        
+    def _post_ui(self, fn, *args):
+        """从后台线程投递 UI 更新：只入队，由主线程轮询执行，后台线程不直接调用 Tk"""
+        self._ui_events.append((fn, args))
+        
+    def _drain_ui_events(self):
+        """在主线程执行全部待处理的 UI 更新，返回执行条数"""
+        count = 0
+        while True:
+            try:
+                fn, args = self._ui_events.popleft()
+            except IndexError:
+                return count
+            fn(*args)
+            count += 1
+        
     def _set_status(self, text: str):
         """线程安全地更新状态文本"""
-        try:
-            self.root.after(0, lambda: self.status_var.set(text))
-        except Exception:
-            # 回退：直接设置（仅在主线程）
-            self.status_var.set(text)
+        self._post_ui(self.status_var.set, text)
         
     def _set_progress(self, value: float):
         """线程安全地更新进度"""
-        try:
-            self.root.after(0, lambda: self.progress_var.set(value))
-        except Exception:
-            self.progress_var.set(value)
+        self._post_ui(self.progress_var.set, value)
         
     def _restore_ui_state_on_finish(self):
         """线程安全地恢复按钮和状态"""
-        def _do_restore():
-            self.processing = False
-            self.start_button.config(state=tk.NORMAL)
-            self.stop_button.config(state=tk.DISABLED)
-            if self.status_var.get() == "正在处理...":
-                self.status_var.set("就绪")
-        try:
-            self.root.after(0, _do_restore)
-        except Exception:
-            _do_restore()
+        self._post_ui(self._restore_ui_state)
+        
+    def _restore_ui_state(self):
+        self.processing = False
+        self.start_button.config(state=tk.NORMAL)
+        self.stop_button.config(state=tk.DISABLED)
+        if self.status_var.get() == "正在处理...":
+            self.status_var.set("就绪")
         
     def _clear_log(self):
         """清空日志显示"""
@@ -550,7 +652,16 @@ VAT Invoice Audit Pipeline v1.0.1
         """打开输出目录"""
         output_dir = self.output_dir_var.get()
         if os.path.exists(output_dir):
-            os.startfile(output_dir)
+            # 以分离的子进程打开资源管理器，立即返回事件循环，避免在慢速网络盘上阻塞界面
+            if sys.platform == 'win32':
+                subprocess.Popen(
+                    ['explorer', os.path.normpath(output_dir)],
+                    creationflags=subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP,
+                    close_fds=True,
+                )
+            else:
+                opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
+                subprocess.Popen([opener, output_dir], close_fds=True, start_new_session=True)
         else:
             _debug_log("准备显示 messagebox.showwarning")
             messagebox.showwarning("目录不存在", f"输出目录不存在：\n{output_dir}", parent=self.root)
@@ -592,85 +703,100 @@ VAT Invoice Audit Pipeline v1.0.1
         self.status_var.set("正在处理...")
         self.progress_var.set(0)
         
-        # 在新线程中运行处理流程
-        thread = threading.Thread(target=self._run_processing, daemon=True)
-        thread.start()
+        # 界面参数在主线程读取，后台线程不访问 Tk 变量
+        overrides = self._build_pipeline_overrides()
+        verbose = bool(self.verbose_var.get())
+        # 交给后台 asyncio 事件循环调度，处理流程本身在守护线程中运行
+        asyncio.run_coroutine_threadsafe(self._run_processing_async(overrides, verbose), self._async_loop)
+        
+    def _start_async_loop(self):
+        """在守护线程中运行常驻 asyncio 事件循环，承载后台任务；Tk mainloop 保持在主线程"""
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, name="vat-gui-asyncio", daemon=True).start()
+        return loop
+        
+    def _import_pipeline_main(self):
+        """导入处理模块（pandas/openpyxl 等依赖较重），缓存入口函数"""
+        from vat_audit_pipeline.main import main as pipeline_main
+        self._pipeline_main = pipeline_main
+        return pipeline_main
+        
+    async def _warmup_imports(self):
+        """启动后在后台预先导入处理模块，使点击“开始”时无需等待导入"""
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._import_pipeline_main)
+            _debug_log("pipeline 模块预热导入完成")
+        except Exception as e:
+            # 预热失败不影响使用，点击“开始”时会再次导入并报告错误
+            _debug_log(f"pipeline 模块预热导入失败: {e}")
+        
+    async def _run_processing_async(self, overrides, verbose=False):
+        """在守护线程中运行处理流程，完成后通过事件循环 future 通知
+
+        不用事件循环的默认线程池：解释器退出时会 join 线程池线程，运行中关闭窗口后进程
+        会一直等到处理结束；守护线程随主线程退出而结束。
+        """
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
         
-    def _run_processing(self):
+        def worker():
+            try:
+                self._run_processing(overrides, verbose)
+            finally:
+                loop.call_soon_threadsafe(done.set_result, None)
+        
+        threading.Thread(target=worker, name="vat-gui-pipeline", daemon=True).start()
+        await done
+        
+    def _build_pipeline_overrides(self):
+        """把界面参数转换为配置覆盖项（与 config.yaml 结构一致，深度合并）；须在主线程调用"""
+        overrides = {
+            "paths": {
+                "input_dir": self.input_dir_var.get(),
+                "output_dir": self.output_dir_var.get(),
+                "database_dir": self.database_dir_var.get(),
+            }
+        }
+        if self.business_tag_var.get():
+            overrides["business"] = {"tag": self.business_tag_var.get()}
+        overrides["parallel"] = {"enabled": bool(self.parallel_var.get())}
+        try:
+            worker_count = int(self.worker_count_var.get())
+        except (tk.TclError, ValueError):
+            worker_count = None
+        # 输入框内容非法时不覆盖，沿用 config.yaml 中的 worker_count
+        if worker_count is not None and worker_count >= 1:
+            overrides["parallel"]["worker_count"] = worker_count
+        return overrides
+        
+    def _run_processing(self, overrides, verbose=False):
         """实际的处理流程（在后台线程中运行）"""
         _debug_log(f"_run_processing 启动, 线程={threading.current_thread().name}")
         try:
             logging.info("=" * 60)
             logging.info("开始处理发票数据...")
             logging.info("=" * 60)
-            _debug_log("准备导入 pipeline 模块")
+            _debug_log(f"multiprocessing 启动方法: {multiprocessing.get_start_method(allow_none=True)}")
+            _debug_log(f"配置覆盖: {overrides}, 详细日志: {verbose}")
             
-            # 设置多进程启动方法（Windows 必须用 spawn 避免重新导入问题）
-            import multiprocessing
-            try:
-                multiprocessing.set_start_method('spawn', force=True)
-                _debug_log("multiprocessing 启动方法设置为 spawn")
-            except RuntimeError:
-                _debug_log("multiprocessing 启动方法已设置")
+            # 通常已由启动时的预热任务导入完成；预热尚未结束时这里会等待同一次导入
+            pipeline_main = self._pipeline_main or self._import_pipeline_main()
+            _debug_log("pipeline 模块已就绪")
             
-            # 在调用流水线前，设置环境覆盖（由Pipeline读取）
-            os.environ["VAT_INPUT_DIR"] = self.input_dir_var.get()
-            os.environ["VAT_OUTPUT_DIR"] = self.output_dir_var.get()
-            os.environ["VAT_DATABASE_DIR"] = self.database_dir_var.get()
-            if self.business_tag_var.get():
-                os.environ["VAT_BUSINESS_TAG"] = self.business_tag_var.get()
-            _debug_log(f"环境覆盖: INPUT={os.environ.get('VAT_INPUT_DIR')}, OUTPUT={os.environ.get('VAT_OUTPUT_DIR')}, DB={os.environ.get('VAT_DATABASE_DIR')}, TAG={os.environ.get('VAT_BUSINESS_TAG')}")
-
-            _debug_log("导入 pipeline 模块")
-            # 导入处理模块
-            from vat_audit_pipeline.main import main as pipeline_main
-            _debug_log("pipeline 模块导入完成")
-            
-            # 命令行参数对当前 main() 不生效，保留日志用途
-            args = [
-                '--input', self.input_dir_var.get(),
-                '--output', self.output_dir_var.get(),
-                '--database', self.database_dir_var.get(),
-            ]
-            
-            if self.business_tag_var.get():
-                args.extend(['--business-tag', self.business_tag_var.get()])
-                
-            if self.parallel_var.get():
-                args.append('--parallel')
-                args.extend(['--workers', str(self.worker_count_var.get())])
-            else:
-                args.append('--no-parallel')
-                
-            if self.verbose_var.get():
-                args.append('--verbose')
-                
             # 更新进度（模拟）
             self._set_progress(10)
             
-            # 保存原始 sys.argv
-            original_argv = sys.argv.copy()
+            # 执行主流程：界面参数作为配置覆盖项直接传入，不再改写 os.environ / sys.argv
+            pipeline_main(overrides=overrides, verbose=verbose)
+            _debug_log("pipeline_main 执行完成")
             
-            try:
-                # 修改 sys.argv 以传递参数
-                sys.argv = ['vat_gui.py'] + args
-                _debug_log(f"准备执行 pipeline_main, argv={sys.argv}")
-                
-                # 执行主流程
-                pipeline_main()
-                _debug_log("pipeline_main 执行完成")
-                
-                # 处理成功
-                self._set_progress(100)
-                self._set_status("处理完成！")
-                logging.info("=" * 60)
-                logging.info("✓ 所有数据处理完成！")
-                logging.info("✓ 请查看输出目录中的结果。")
-                logging.info("=" * 60)
-                
-            finally:
-                # 恢复 sys.argv
-                sys.argv = original_argv
+            # 处理成功
+            self._set_progress(100)
+            self._set_status("处理完成！")
+            logging.info("=" * 60)
+            logging.info("✓ 所有数据处理完成！")
+            logging.info("✓ 请查看输出目录中的结果。")
+            logging.info("=" * 60)
                 
         except Exception as e:
             _debug_log(f"捕获异常: {type(e).__name__}: {e}")
@@ -697,10 +823,36 @@ VAT Invoice Audit Pipeline v1.0.1
     def _on_closing(self):
         """窗口关闭时的处理"""
         if self.processing:
-            if messagebox.askokcancel("退出确认", "程序正在处理数据，确定要退出吗？", parent=self.root):
-                self.root.destroy()
-        else:
-            self.root.destroy()
+            if not messagebox.askokcancel("退出确认", "程序正在处理数据，确定要退出吗？", parent=self.root):
+                return
+        self._stop_log_listener()
+        # 处理仍在运行时，流程所在的守护线程不会阻止进程退出：主线程结束即终止（可能留下不完整数据，已在上方确认）
+        self._async_loop.call_soon_threadsafe(self._async_loop.stop)
+        self.root.destroy()
+        
+    def _stop_log_listener(self):
+        """停止日志监听线程（会先处理完队列中剩余的记录）"""
+        if self._log_listener is not None:
+            try:
+                self._log_listener.stop()
+            except Exception:
+                pass
+            self._log_listener = None
+
+
+_FONT_FAMILY_CACHE = {}
+
+
+def _resolve_font_family(root, preferred: str, fallback: str) -> str:
+    """返回可用的字体族：preferred 已安装则用之，否则用 fallback（结果按进程缓存）。
+
+    直接让 Tk 解析该字体名并比对实际字体族，不必枚举系统全部字体（tkfont.families）。
+    """
+    key = (preferred, fallback)
+    if key not in _FONT_FAMILY_CACHE:
+        actual = tkfont.Font(root=root, family=preferred).actual('family')
+        _FONT_FAMILY_CACHE[key] = preferred if actual.lower() == preferred.lower() else fallback
+    return _FONT_FAMILY_CACHE[key]
 
 
 def main():
@@ -752,9 +904,7 @@ def main():
 
         # 应用更适合中文显示的默认字体
         try:
-            preferred = "Microsoft YaHei UI"
-            families = set(tkfont.families(root))
-            family = preferred if preferred in families else "Segoe UI"
+            family = _resolve_font_family(root, "Microsoft YaHei UI", "Segoe UI")
             for name in ("TkDefaultFont", "TkTextFont", "TkFixedFont", "TkMenuFont", "TkHeadingFont"):
                 f = tkfont.nametofont(name)
                 f.configure(family=family, size=10)
@@ -813,5 +963,16 @@ if __name__ == '__main__':
     except:
         pass
     
+    # 进程级只设置一次多进程启动方法，不在每次点击“开始”时 force 重建上下文：
+    # Windows 只能用 spawn；其他平台用 forkserver，重量级依赖在服务进程中只导入一次，worker 由其 fork 得到
+    start_method = 'spawn' if sys.platform == 'win32' else 'forkserver'
+    try:
+        multiprocessing.set_start_method(start_method)
+        if start_method == 'forkserver':
+            # 预加载失败（未安装）的模块会被忽略
+            multiprocessing.set_forkserver_preload(['pandas', 'numpy', 'openpyxl', 'chardet'])
+    except (RuntimeError, ValueError):
+        pass
+    
     # 启动 GUI
     main()
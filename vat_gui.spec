@@ -64,7 +64,6 @@ hiddenimports = [
     # tkinter 相关
     'tkinter',
     'tkinter.ttk',
-    'tkinter.scrolledtext',
     'tkinter.filedialog',
     'tkinter.messagebox',
     # 标准库（明确列出以防遗漏）
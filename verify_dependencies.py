@@ -8,22 +8,40 @@
     python verify_dependencies.py
 """
 
+import importlib
+import importlib.util
 import sys
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
+from typing import List, Optional, Tuple
 
 
-def check_dependency(name: str, version_attr: str = '__version__') -> Tuple[bool, str]:
+def check_dependency(name: str, version_attr: Optional[str] = '__version__') -> Tuple[bool, str]:
     """检查单个依赖包是否已安装。
     
     Args:
         name: 包名
-        version_attr: 版本属性名称
+        version_attr: 版本属性名称；为空时只检查模块是否存在，不导入
     
     Returns:
         (是否安装成功, 版本号或错误信息)
     """
+    # find_spec 只在 sys.path 上定位模块、不执行它；仅在需要读取版本号时才真正导入
     try:
-        module = __import__(name)
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError) as e:
+        return False, str(e)
+    if spec is None:
+        return False, f"No module named '{name}'"
+    if not version_attr:
+        return True, 'unknown'
+    # 优先从安装元数据读取版本号（不执行包的初始化代码）；无元数据时才导入模块读取版本属性
+    try:
+        return True, metadata.version(name)
+    except metadata.PackageNotFoundError:
+        pass
+    try:
+        module = importlib.import_module(name)
         version = getattr(module, version_attr, 'unknown')
         return True, str(version)
     except ImportError as e:
@@ -71,10 +89,23 @@ def main():
         ('tqdm', '>=4.65.0'),
     ]
     
+    stdlib_modules = [
+        'sqlite3',
+        'logging',
+        'multiprocessing',
+        'json',
+        'datetime',
+    ]
+    
+    # 各项检查相互独立（主要是文件系统查找），并发执行；map 保持输出顺序
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        dep_checks = executor.map(check_dependency, [name for name, _ in dependencies])
+        stdlib_checks = executor.map(lambda name: check_dependency(name, version_attr=None), stdlib_modules)
+        dep_checks, stdlib_checks = list(dep_checks), list(stdlib_checks)
+    
     results: List[Tuple[str, bool, str, str]] = []
     
-    for name, requirement in dependencies:
-        ok, version = check_dependency(name)
+    for (name, requirement), (ok, version) in zip(dependencies, dep_checks):
         status = "✅" if ok else "❌"
         results.append((name, ok, version, requirement))
         
@@ -87,17 +118,8 @@ def main():
     print("\n3. Python 标准库检查（抽样）")
     print("-" * 70)
     
-    stdlib_modules = [
-        'sqlite3',
-        'logging',
-        'multiprocessing',
-        'json',
-        'datetime',
-    ]
-    
     stdlib_ok = True
-    for name in stdlib_modules:
-        ok, version = check_dependency(name, 'unknown')
+    for name, (ok, _) in zip(stdlib_modules, stdlib_checks):
         status = "✅" if ok else "❌"
         print(f"{status} {name:15} {'可用' if ok else '不可用'}")
         if not ok:
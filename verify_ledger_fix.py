@@ -2,48 +2,166 @@
 # -*- coding: utf-8 -*-
 """验证 LEDGER 表是否已成功填充数据"""
 
+import json
 import sqlite3
 import os
-import glob
+import sys
+from pathlib import Path
 
-# 找到最新的数据库文件
-db_files = sorted(glob.glob('Database/*.db'), key=os.path.getmtime, reverse=True)
-if not db_files:
+# 状态标记：按 (无数据, 有数据) 顺序存放，用 count > 0 直接索引
+ROW_STATUS = ('❌', '✅')
+HEADER_STATUS = ('❌ 无数据', '✅ 有数据')
+
+# 报告行模板：预先取得 str.format 绑定方法，循环内直接调用
+ROW_LINE = '{} {}: {:>6} 行'.format
+HEADER_LINE = '{}: {} ({} 行)'.format
+TOTAL_LINE = '\n📈 总计: {} 行'.format
+
+# SQLite 单条复合 SELECT 最多 500 项（SQLITE_MAX_COMPOUND_SELECT 默认值）
+COUNT_BATCH_SIZE = 400
+
+
+def count_rows(cursor, table_names, without_rowid=frozenset()):
+    """用 UNION ALL 把多张表的行数查询合并为一条查询，返回 ({表名: 行数}, 总行数)
+
+    表名无法作为参数绑定，合并后每批只编译一条语句。不读取 sqlite_stat1：
+    那里只有 ANALYZE 时的近似行数，且需要写库，不适合做数据校验。
+
+    ODS 表只由 to_sql 整表重建或追加写入、从不删除行，rowid 从 1 连续递增，
+    因此 MAX(_rowid_)（只需沿 B 树下探到最右叶子）与 COUNT(*)（扫描全表）相等；
+    WITHOUT ROWID 表没有 rowid，仍用 COUNT(*)。
+
+    每批的合计由 SQLite 在同一条语句中算出（idx 为 -1 的末行），Python 只累加各批合计。
+    """
+    # 表名一次性转义为带引号的标识符（内嵌双引号写成两个），异常表名也不会破坏 SQL
+    quoted = [(name, '"' + name.replace('"', '""') + '"') for name in table_names]
+    counts = {}
+    total = 0
+    for start in range(0, len(quoted), COUNT_BATCH_SIZE):
+        batch = table_names[start:start + COUNT_BATCH_SIZE]
+        union = ' UNION ALL '.join(
+            f'SELECT {i} AS idx, {"COUNT(*)" if name in without_rowid else "COALESCE(MAX(_rowid_), 0)"} AS n FROM {ident}'
+            for i, (name, ident) in enumerate(quoted[start:start + COUNT_BATCH_SIZE])
+        )
+        # 被引用两次的 CTE 由 SQLite 物化，各表只计数一次
+        sql = f'WITH c(idx, n) AS ({union}) SELECT idx, n FROM c UNION ALL SELECT -1, SUM(n) FROM c'
+        # 直接迭代游标逐行取结果，不先物化整批结果列表
+        for idx, n in cursor.execute(sql):
+            if idx < 0:
+                total += n
+            else:
+                counts[batch[idx]] = n
+    return counts, total
+
+
+def db_fingerprint(db_path):
+    """数据库文件（及 WAL 模式下的 -wal 文件）的 (mtime_ns, size)，任一变化即视为库已改动"""
+    fingerprint = []
+    for path in (db_path, f'{db_path}-wal'):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            fingerprint.append(None)
+        else:
+            fingerprint.append([st.st_mtime_ns, st.st_size])
+    return fingerprint
+
+
+def load_cached_report(cache_path, fingerprint):
+    """读取上次校验的报告；指纹不一致或缓存损坏时返回 None"""
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict) or cache.get('fingerprint') != fingerprint:
+        return None
+    return cache.get('report')
+
+
+def save_cached_report(cache_path, fingerprint, report):
+    """先写临时文件再 os.replace，保证缓存文件要么是旧版本要么是完整的新版本"""
+    tmp_path = f'{cache_path}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': fingerprint, 'report': report}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+# 找到最新的数据库文件：单次 scandir，DirEntry 缓存 stat 结果；只需最新一个，用 max 代替排序
+try:
+    with os.scandir('Database') as it:
+        db_entries = [e for e in it if e.name.endswith('.db') and not e.name.startswith('.') and e.is_file()]
+except FileNotFoundError:
+    db_entries = []
+if not db_entries:
     print('❌ 没有找到数据库文件')
     exit(1)
 
-db_path = db_files[0]
+db_path = max(db_entries, key=lambda e: e.stat().st_mtime).path
 print(f'📊 使用数据库: {db_path}')
 
-conn = sqlite3.connect(db_path)
+# 只读校验：库文件未变化时输出与上次完全相同，直接复用缓存的报告，不打开 SQLite
+cache_path = f'{db_path}.verify_ledger.cache'
+fingerprint = db_fingerprint(db_path)
+cached_report = load_cached_report(cache_path, fingerprint)
+if cached_report is not None:
+    sys.stdout.write(cached_report)
+    sys.exit(0)
+
+# 只读打开：脚本只做查询，不获取写锁。不加 immutable=1——库使用 WAL，
+# immutable 会忽略尚未 checkpoint 的 -wal 内容，导致行数偏少
+conn = sqlite3.connect(f'{Path(db_path).resolve().as_uri()}?mode=ro', uri=True)
+conn.execute('PRAGMA query_only=1')
 cursor = conn.cursor()
+# 加大页缓存（64MB）并启用 mmap（256MB），多表 COUNT(*) 扫描时页面保留在内存中
+cursor.executescript("""
+PRAGMA cache_size=-65536;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+""")
+# 所有读取放在同一个显式读事务中：只获取一次共享锁，表清单与行数来自同一快照
+conn.isolation_level = None
+cursor.execute('BEGIN')
 
 
 # 查询所有以新规范 ODS_VAT_INV_HEADER_FULL_ 和 ODS_VAT_INV_DETAIL_FULL_ 开头的表
-cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND (name LIKE 'ODS_VAT_INV_HEADER_FULL_%' OR name LIKE 'ODS_VAT_INV_DETAIL_FULL_%') ORDER BY name")
-tables = cursor.fetchall()
+# （GLOB 区分大小写且 _ 不是通配符，与下方 startswith 前缀筛选完全一致）
+# 直接迭代游标，单次遍历同时收集表名、WITHOUT ROWID 表和 HEADER 表，不先 fetchall 物化结果列表
+table_names = []
+without_rowid = set()
+header_tables = []
+for table_name, sql in cursor.execute("SELECT name, sql FROM sqlite_master WHERE type='table' AND (name GLOB 'ODS_VAT_INV_HEADER_FULL_*' OR name GLOB 'ODS_VAT_INV_DETAIL_FULL_*') ORDER BY name"):
+    table_names.append(table_name)
+    if sql and 'WITHOUT ROWID' in sql.upper():
+        without_rowid.add(table_name)
+    # HEADER 表是结果的子集，按前缀筛选，后面直接复用已取得的行数
+    if table_name.startswith('ODS_VAT_INV_HEADER_FULL_'):
+        header_tables.append(table_name)
 
-print(f'\n✅ 找到 {len(tables)} 个 ODS 表：\n')
+# 报告各行先收集，最后一次性写出（Windows 控制台每次 print 都是一次较慢的写调用）
+lines = [f'\n✅ 找到 {len(table_names)} 个 ODS 表：\n']
+# 逐表循环内不再重复查找 append 属性
+add_line = lines.append
 
-total_rows = 0
-for table_name, in tables:
-    cursor.execute(f'SELECT COUNT(*) FROM "{table_name}"')
-    count = cursor.fetchone()[0]
-    total_rows += count
-    status = '✅' if count > 0 else '❌'
-    print(f'{status} {table_name}: {count:>6} 行')
+counts, total_rows = count_rows(cursor, table_names, without_rowid)
 
-print(f'\n📈 总计: {total_rows} 行')
+for table_name in table_names:
+    count = counts[table_name]
+    add_line(ROW_LINE(ROW_STATUS[count > 0], table_name, count))
 
-# 分析 HEADER 表是否都有数据
-cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE 'ODS_VAT_INV_HEADER_FULL_%' ORDER BY name")
-header_tables = cursor.fetchall()
+add_line(TOTAL_LINE(total_rows))
 
-print(f'\n🔍 HEADER 表详情：\n')
-for table_name, in header_tables:
-    cursor.execute(f'SELECT COUNT(*) FROM "{table_name}"')
-    count = cursor.fetchone()[0]
-    status = '✅ 有数据' if count > 0 else '❌ 无数据'
-    print(f'{status}: {table_name} ({count} 行)')
+add_line('\n🔍 HEADER 表详情：\n')
+for table_name in header_tables:
+    count = counts[table_name]
+    add_line(HEADER_LINE(HEADER_STATUS[count > 0], table_name, count))
 
+cursor.execute('COMMIT')
 conn.close()
+
+report = '\n'.join(lines) + '\n'
+sys.stdout.write(report)
+save_cached_report(cache_path, fingerprint, report)